@@ -1,50 +1,109 @@
 import re
 from typing import Iterable
 
+import numpy as np
+
+# Compiled once at import: the chunker runs on every ingested document,
+# and boundary detection should be a single C-level scan over the text
+# rather than per-call pattern setup
+_WHITESPACE_RE = re.compile(r"\s+")
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+")
+
 
 def chunk(text: str, chunk_size: int = 240, overlap: int = 40) -> Iterable[str]:
+    return [c for c, _, _ in chunk_with_spans(text, chunk_size, overlap)]
+
+
+def chunk_with_spans(
+    text: str, chunk_size: int = 240, overlap: int = 40
+) -> list[tuple[str, int, int]]:
+    """Chunk text, returning (chunk, start, end) triples.
+
+    Offsets index into the whitespace-normalized text (runs of
+    whitespace collapsed to single spaces), so callers can verify
+    coverage with a position mask instead of concatenating chunks.
+    """
     if not text:
         return []
 
-    sentences = _split_sentences(text)
-    if not sentences:
+    cleaned = _WHITESPACE_RE.sub(" ", text).strip()
+    spans = _sentence_spans(cleaned)
+    if not spans:
         return []
 
-    chunks: list[str] = []
-    current: list[str] = []
-    current_len = 0
-    sentence_lens = [len(sentence.split()) for sentence in sentences]
+    # Cumulative word counts let every boundary decision become a
+    # binary search over precomputed sums instead of re-measuring
+    # sentences while accumulating: cum[i] is the number of words in
+    # sentences[:i], so a window's size is one subtraction
+    n = len(spans)
+    lens = np.fromiter(
+        (cleaned.count(" ", a, b) + 1 for a, b in spans), dtype=np.int64, count=n
+    )
+    cum = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(lens, out=cum[1:])
+
+    chunks: list[tuple[str, int, int]] = []
+    start = 0  # first sentence of the current window
+    first_new = 0  # sentences before this are carried overlap
+    while True:
+        # End of this window: the first sentence whose addition would
+        # exceed chunk_size — but never before the carried overlap
+        # ends, and never an empty window (an oversized sentence still
+        # gets a chunk of its own)
+        end = int(np.searchsorted(cum, cum[start] + chunk_size, side="right")) - 1
+        end = max(end, first_new, start + 1)
+        end = min(end, n)
+        # Sentences are separated by single spaces in the cleaned
+        # text, so a window is a contiguous slice — no join needed
+        lo, hi = spans[start][0], spans[end - 1][1]
+        chunks.append((cleaned[lo:hi], lo, hi))
+        if end >= n:
+            break
+
+        # Next window starts at the overlap tail: the longest suffix
+        # of this window within the overlap budget, but at least one
+        # sentence, never reaching before the window start
+        if overlap > 0:
+            tail = int(np.searchsorted(cum, cum[end] - overlap, side="left"))
+            start = min(max(tail, start), end - 1)
+        else:
+            start = end
+        first_new = end + 1
 
-    for sentence, length in zip(sentences, sentence_lens):
-        if current_len + length > chunk_size and current:
-            chunks.append(" ".join(current).strip())
-            current, current_len = _overlap_tail(current, overlap)
+    return chunks
 
-        current.append(sentence)
-        current_len += length
 
-    if current:
-        chunks.append(" ".join(current).strip())
+def coverage_mask(text_len: int, chunks_with_offsets) -> np.ndarray:
+    """Boolean coverage over normalized-text positions.
 
-    return [c for c in chunks if c]
+    Built from interval endpoints with a difference array rather than
+    per-chunk slice assignment, so cost scales with the number of
+    chunks, not total chunk length.
+    """
+    delta = np.zeros(text_len + 1, dtype=np.int64)
+    for _, lo, hi in chunks_with_offsets:
+        delta[lo] += 1
+        delta[hi] -= 1
+    return np.cumsum(delta[:text_len]) > 0
 
 
 def _split_sentences(text: str) -> list[str]:
-    cleaned = re.sub(r"\s+", " ", text).strip()
+    cleaned = _WHITESPACE_RE.sub(" ", text).strip()
+    return [cleaned[a:b] for a, b in _sentence_spans(cleaned)]
+
+
+def _sentence_spans(cleaned: str) -> list[tuple[int, int]]:
     if not cleaned:
         return []
-    return [s for s in re.split(r"(?<=[.!?])\s+", cleaned) if s]
-
+    # One finditer pass over the cleaned text; the lookbehind keeps
+    # decimals like $100.50 intact since the terminator must be
+    # followed by whitespace
+    spans = []
+    start = 0
+    for match in _SENTENCE_END_RE.finditer(cleaned):
+        spans.append((start, match.start()))
+        start = match.end()
+    if start < len(cleaned):
+        spans.append((start, len(cleaned)))
+    return spans
 
-def _overlap_tail(sentences: list[str], overlap_words: int) -> tuple[list[str], int]:
-    if overlap_words <= 0:
-        return [], 0
-    tail: list[str] = []
-    count = 0
-    for sentence in reversed(sentences):
-        length = len(sentence.split())
-        if count + length > overlap_words and tail:
-            break
-        tail.insert(0, sentence)
-        count += length
-    return tail, count
@@ -8,15 +8,26 @@ Provides:
 """
 from __future__ import annotations
 
+import functools
 import logging
 import os
 import subprocess
 import sys
+from array import array
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Tuple
 
 logger = logging.getLogger("rag")
 
+# Import once at module load instead of re-importing inside every call;
+# PDF helpers degrade gracefully when PyMuPDF is missing
+try:
+    import fitz  # PyMuPDF
+except ImportError:
+    fitz = None
+
 
 # ============================================================================
 # Document Opening with Location
@@ -55,42 +66,76 @@ def open_document(filepath: str, search_text: str | None = None) -> bool:
         return False
 
 
+def _spawn_nowait(argv: list[str]) -> None:
+    """Launch a helper like open/xdg-open without waiting for it.
+
+    The helpers hand the file to the default app and exit on their own;
+    waiting on them only adds latency to the click.
+    """
+    subprocess.Popen(
+        argv,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        close_fds=True,
+        start_new_session=True,
+    )
+
+
+# AppleScript template for "open PDF in Preview and search" — built once,
+# filled per call with pre-escaped values
+_PREVIEW_SEARCH_SCRIPT = '''
+tell application "Preview"
+    activate
+    open POSIX file "{filepath}"
+    delay 0.5
+end tell
+
+tell application "System Events"
+    tell process "Preview"
+        keystroke "f" using command down
+        delay 0.2
+        keystroke "{search_text}"
+        delay 0.2
+        keystroke return
+    end tell
+end tell
+'''
+
+
 def _open_document_macos(filepath: str, ext: str, search_text: str | None) -> bool:
     """Open document on macOS with optional search."""
-    
+
     if ext == ".pdf" and search_text:
         # Open PDF and search for text using AppleScript
-        script = f'''
-        tell application "Preview"
-            activate
-            open POSIX file "{filepath}"
-            delay 0.5
-        end tell
-        
-        tell application "System Events"
-            tell process "Preview"
-                keystroke "f" using command down
-                delay 0.2
-                keystroke "{search_text}"
-                delay 0.2
-                keystroke return
-            end tell
-        end tell
-        '''
+        script = _PREVIEW_SEARCH_SCRIPT.format(
+            filepath=filepath.replace('"', '\\"'),
+            search_text=search_text.replace('\\', '\\\\').replace('"', '\\"'),
+        )
         try:
-            subprocess.run(
-                ["osascript", "-e", script],
-                check=False,
-                capture_output=True,
-                timeout=10,
+            # Read the script from stdin; no capture pipes since the
+            # output is never read
+            proc = subprocess.Popen(
+                ["osascript", "-"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
             )
-            return True
+            try:
+                proc.communicate(script.encode(), timeout=3)
+                return True
+            except subprocess.TimeoutExpired:
+                # Kill the script before the plain-open fallback: left
+                # running, it would keep driving Preview and typing
+                # into whatever window has focus
+                proc.kill()
+                proc.communicate()
         except Exception:
             # Fall back to simple open
             pass
-    
-    # Default: just open the file
-    subprocess.run(["open", filepath], check=False)
+
+    # Default: just open the file without waiting for it
+    _spawn_nowait(["open", filepath])
     return True
 
 
@@ -102,7 +147,7 @@ def _open_document_windows(filepath: str, ext: str, search_text: str | None) ->
 
 def _open_document_linux(filepath: str) -> bool:
     """Open document on Linux."""
-    subprocess.run(["xdg-open", filepath], check=False)
+    _spawn_nowait(["xdg-open", filepath])
     return True
 
 
@@ -123,10 +168,7 @@ def open_pdf_at_page(filepath: str, page: int) -> bool:
     if sys.platform == "darwin":
         # macOS: Use Preview's URL scheme
         # Note: This may not work in all versions
-        subprocess.run(
-            ["open", "-a", "Preview", filepath],
-            check=False
-        )
+        _spawn_nowait(["open", "-a", "Preview", filepath])
         return True
     else:
         return open_document(filepath)
@@ -136,40 +178,177 @@ def open_pdf_at_page(filepath: str, page: int) -> bool:
 # Find Text in Document
 # ============================================================================
 
-def find_text_in_pdf(filepath: str, search_text: str) -> list[Tuple[int, str]]:
+# Parallel extraction only pays off once a document has enough pages to
+# amortize the per-shard document open
+_PARALLEL_PAGE_THRESHOLD = 32
+_PAGES_PER_SHARD = 16
+
+_pdf_executor: ThreadPoolExecutor | None = None
+
+
+def _get_pdf_executor() -> ThreadPoolExecutor:
+    """Get or create the shared page-extraction thread pool (singleton)."""
+    global _pdf_executor
+    if _pdf_executor is None:
+        _pdf_executor = ThreadPoolExecutor(
+            max_workers=os.cpu_count() or 4,
+            thread_name_prefix="pdf-extract",
+        )
+    return _pdf_executor
+
+
+def _extract_page_range(filepath: str, start: int, stop: int) -> list[str]:
+    """Extract text for pages [start, stop) with a worker-local document.
+
+    Each worker opens its own fitz.Document because PyMuPDF documents
+    are not safe to share across threads; get_text releases the GIL so
+    shards genuinely run in parallel.
+    """
+    doc = fitz.open(filepath)
+    try:
+        return [doc[i].get_text("text") for i in range(start, stop)]
+    finally:
+        doc.close()
+
+
+@functools.lru_cache(maxsize=64)
+def _load_pdf_pages(filepath: str, mtime_ns: int, size: int) -> Tuple[int, tuple]:
+    """
+    Extract page texts from a PDF once and memoize the result.
+
+    The (mtime_ns, size) arguments exist purely to key the cache, so an
+    edited file automatically misses and gets re-parsed. Large documents
+    are sharded across the extraction thread pool.
+
+    Returns:
+        (page_count, tuple of per-page text strings)
+    """
+    if fitz is None:
+        raise RuntimeError("PyMuPDF is not installed")
+
+    doc = fitz.open(filepath)
+    try:
+        page_count = doc.page_count
+        if page_count < _PARALLEL_PAGE_THRESHOLD:
+            return page_count, tuple(page.get_text("text") for page in doc)
+    finally:
+        doc.close()
+
+    # Shard the page range and extract concurrently
+    executor = _get_pdf_executor()
+    futures = [
+        executor.submit(_extract_page_range, filepath, start, min(start + _PAGES_PER_SHARD, page_count))
+        for start in range(0, page_count, _PAGES_PER_SHARD)
+    ]
+
+    pages: list[str] = []
+    for future in futures:
+        pages.extend(future.result())
+
+    return page_count, tuple(pages)
+
+
+@functools.lru_cache(maxsize=64)
+def _page_search_buffer(filepath: str, mtime_ns: int, size: int) -> Tuple[str, array]:
+    """
+    Build a single lowercased search buffer over all pages of a PDF.
+
+    Pages are joined with a NUL sentinel (so matches can't span page
+    boundaries) and a parallel array of page-start offsets lets a hit
+    index be mapped back to its page with one bisect.
+    """
+    _, pages = _load_pdf_pages(filepath, mtime_ns, size)
+
+    offsets = array("L")
+    pos = 0
+    for text in pages:
+        offsets.append(pos)
+        pos += len(text) + 2  # account for the "\x00\x00" sentinel
+
+    return "\x00\x00".join(pages).lower(), offsets
+
+
+def find_first_text_in_pdf(filepath: str, search_text: str) -> Tuple[int, str] | None:
+    """
+    Find the first occurrence of text in a PDF, stopping at the first hit.
+
+    Unlike find_text_in_pdf this never extracts pages past the match, so
+    an answer on page 2 of a 500-page document costs two pages of work.
+
+    Returns:
+        (page_number, context_snippet) or None if not found
+    """
+    if fitz is None:
+        return None
+
+    try:
+        doc = fitz.open(filepath)
+        try:
+            for page_num, page in enumerate(doc, start=1):
+                hits = page.search_for(search_text, quads=False)
+                if not hits:
+                    continue
+
+                clip = hits[0].irect + (-50, -50, 50, 50)
+                context = " ".join(page.get_text("text", clip=clip).split())
+                return page_num, "..." + context + "..."
+        finally:
+            doc.close()
+
+        return None
+
+    except Exception as e:
+        logger.error("Error searching PDF: %s", e)
+        return None
+
+
+def find_text_in_pdf(
+    filepath: str,
+    search_text: str,
+    max_results: int | None = None,
+) -> list[Tuple[int, str]]:
     """
     Find text in a PDF and return page numbers and context.
-    
+
     Args:
         filepath: Path to PDF file
         search_text: Text to search for
-    
+        max_results: Stop after this many hits (None for all)
+
     Returns:
         List of (page_number, context_snippet) tuples
     """
     try:
-        from PyPDF2 import PdfReader
-        
+        st = os.stat(filepath)
+        _, pages = _load_pdf_pages(filepath, st.st_mtime_ns, st.st_size)
+        buf, offsets = _page_search_buffer(filepath, st.st_mtime_ns, st.st_size)
+
         results = []
-        reader = PdfReader(filepath)
-        search_lower = search_text.lower()
-        
-        for page_num, page in enumerate(reader.pages, start=1):
-            text = page.extract_text() or ""
-            text_lower = text.lower()
-            
-            if search_lower in text_lower:
-                # Find the position and extract context
-                idx = text_lower.find(search_lower)
-                start = max(0, idx - 50)
-                end = min(len(text), idx + len(search_text) + 50)
-                context = text[start:end].strip()
-                context = "..." + context + "..." if start > 0 else context + "..."
-                
-                results.append((page_num, context))
-        
+        needle = search_text.lower()
+
+        # One C-level scan per hit instead of a Python loop over pages
+        idx = buf.find(needle)
+        while idx != -1:
+            page_idx = bisect_right(offsets, idx) - 1
+            text = pages[page_idx]
+            local = idx - offsets[page_idx]
+
+            # Extract context around the first hit on this page
+            start = max(0, local - 50)
+            end = min(len(text), local + len(search_text) + 50)
+            context = " ".join(text[start:end].split())
+            context = "..." + context + "..." if start > 0 else context + "..."
+
+            results.append((page_idx + 1, context))
+            if max_results is not None and len(results) >= max_results:
+                break
+
+            # One result per page: resume the scan at the next page
+            next_page = offsets[page_idx + 1] if page_idx + 1 < len(offsets) else len(buf)
+            idx = buf.find(needle, next_page)
+
         return results
-    
+
     except Exception as e:
         logger.error("Error searching PDF: %s", e)
         return []
@@ -192,9 +371,10 @@ def find_answer_location(
     ext = Path(filepath).suffix.lower()
     
     if ext == ".pdf":
-        results = find_text_in_pdf(filepath, answer_text)
-        if results:
-            page_num, context = results[0]
+        # Only the first hit is needed, so stop parsing at the match
+        result = find_first_text_in_pdf(filepath, answer_text)
+        if result:
+            page_num, context = result
             return {
                 "page": page_num,
                 "context": context,
@@ -231,25 +411,22 @@ def generate_pdf_thumbnail(
         Path to generated thumbnail or None if failed
     """
     try:
-        # Try using pdf2image if available
-        try:
-            from pdf2image import convert_from_path
-            
-            images = convert_from_path(
-                filepath,
-                first_page=1,
-                last_page=1,
-                size=size,
-            )
-            
-            if images:
-                if output_path is None:
-                    output_path = filepath + ".thumb.png"
-                images[0].save(output_path, "PNG")
+        # Render in-process with PyMuPDF at thumbnail resolution —
+        # no poppler subprocess and no full-res render to downscale
+        if fitz is not None:
+            if output_path is None:
+                output_path = filepath + ".thumb.png"
+
+            doc = fitz.open(filepath)
+            try:
+                page = doc.load_page(0)
+                zoom = max(size) / max(page.rect.width, page.rect.height)
+                pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+                pix.save(output_path)
                 return output_path
-        except ImportError:
-            pass
-        
+            finally:
+                doc.close()
+
         # Fallback: Try using macOS Quick Look
         if sys.platform == "darwin":
             if output_path is None:
@@ -284,35 +461,37 @@ def get_document_info(filepath: str) -> dict:
     Returns:
         Dict with file info (size, type, page count for PDFs)
     """
-    path = Path(filepath)
-    
-    if not path.exists():
+    # One stat covers the existence check and both size fields
+    try:
+        st = os.stat(filepath)
+    except OSError:
         return {"error": "File not found"}
-    
+
+    ext = os.path.splitext(filepath)[1].lower()
+
     info = {
-        "filepath": str(path),
-        "filename": path.name,
-        "extension": path.suffix.lower(),
-        "size_bytes": path.stat().st_size,
-        "size_human": _format_size(path.stat().st_size),
+        "filepath": filepath,
+        "filename": os.path.basename(filepath),
+        "extension": ext,
+        "size_bytes": st.st_size,
+        "size_human": _format_size(st.st_size),
     }
-    
+
     # Get page count for PDFs
-    if path.suffix.lower() == ".pdf":
+    if ext == ".pdf":
         try:
-            from PyPDF2 import PdfReader
-            reader = PdfReader(str(path))
-            info["page_count"] = len(reader.pages)
+            info["page_count"] = _load_pdf_pages(filepath, st.st_mtime_ns, st.st_size)[0]
         except Exception:
             info["page_count"] = None
-    
+
     return info
 
 
+_SIZE_UNITS = ("B", "KB", "MB", "GB", "TB")
+
+
 def _format_size(size_bytes: int) -> str:
     """Format file size in human-readable form."""
-    for unit in ["B", "KB", "MB", "GB"]:
-        if size_bytes < 1024:
-            return f"{size_bytes:.1f} {unit}"
-        size_bytes /= 1024
-    return f"{size_bytes:.1f} TB"
+    # Closed-form unit pick: each unit covers 10 bits, no division loop
+    unit_idx = min(max(0, (size_bytes.bit_length() - 1) // 10), len(_SIZE_UNITS) - 1)
+    return f"{size_bytes / (1 << (unit_idx * 10)):.1f} {_SIZE_UNITS[unit_idx]}"
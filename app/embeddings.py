@@ -40,6 +40,12 @@ def get_cached_model(model_name: str = DEFAULT_MODEL) -> SentenceTransformer:
         return _model_cache[model_name]
 
 
+def peek_cached_model(model_name: str = DEFAULT_MODEL) -> SentenceTransformer | None:
+    """Return the cached model if already loaded, without loading it."""
+    with _cache_lock:
+        return _model_cache.get(model_name)
+
+
 def preload_model(model_name: str = DEFAULT_MODEL) -> None:
     """
     Pre-load the embedding model in background.
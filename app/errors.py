@@ -8,6 +8,7 @@ Provides:
 """
 from __future__ import annotations
 
+import json
 from enum import Enum
 from typing import Any
 
@@ -37,23 +38,34 @@ class RAGError(Exception):
         self.suggestion = suggestion
         self.severity = severity
         self.details = details or {}
-    
+        self._ui_str: str | None = None
+        self._dict: dict | None = None
+
     def to_dict(self) -> dict:
         """Convert to dictionary for API responses."""
-        return {
-            "error": self.message,
-            "user_message": self.user_message,
-            "suggestion": self.suggestion,
-            "severity": self.severity.value,
-            "details": self.details,
-        }
+        # The string fields are immutable, so build that part of the
+        # template once; details is a nested dict, so each call gets
+        # its own copy rather than a shared reference
+        if self._dict is None:
+            self._dict = {
+                "error": self.message,
+                "user_message": self.user_message,
+                "suggestion": self.suggestion,
+                "severity": self.severity.value,
+            }
+        result = dict(self._dict)
+        result["details"] = dict(self.details)
+        return result
     
     def format_for_ui(self) -> str:
         """Format error for display in UI."""
-        parts = [f"❌ {self.user_message}"]
-        if self.suggestion:
-            parts.append(f"💡 {self.suggestion}")
-        return "\n".join(parts)
+        # user_message/suggestion never change, so render once
+        if self._ui_str is None:
+            parts = [f"❌ {self.user_message}"]
+            if self.suggestion:
+                parts.append(f"💡 {self.suggestion}")
+            self._ui_str = "\n".join(parts)
+        return self._ui_str
 
 
 class ConfigurationError(RAGError):
@@ -184,36 +196,36 @@ def encryption_error(operation: str) -> RAGError:
 # Error Formatting
 # ============================================================================
 
+# Exception classes mapped to prebuilt friendly messages. Checked with
+# isinstance so subclasses match too; most specific classes come first
+# (JSONDecodeError is a ValueError, FileNotFoundError an OSError).
+_FRIENDLY_MESSAGES: tuple[tuple[type, str], ...] = (
+    (FileNotFoundError, "❌ File not found\n💡 Check if the file exists"),
+    (PermissionError, "❌ Permission denied\n💡 Check file permissions"),
+    (ConnectionError, "❌ Connection failed\n💡 Check your internet connection"),
+    (TimeoutError, "❌ Request timed out\n💡 Try again in a moment"),
+    (json.JSONDecodeError, "❌ Invalid data format\n💡 The file may be corrupted"),
+    (KeyError, "❌ Missing configuration\n💡 Check your settings"),
+    (ValueError, "❌ Invalid value\n💡 Check your input"),
+)
+
+
 def format_exception_for_user(exc: Exception) -> str:
     """
     Format any exception into a user-friendly message.
-    
+
     Handles both RAGError and standard exceptions.
     """
     if isinstance(exc, RAGError):
         return exc.format_for_ui()
-    
-    # Handle common Python exceptions
-    exc_type = type(exc).__name__
-    exc_msg = str(exc)
-    
-    # Map common exceptions to friendly messages
-    friendly_messages = {
-        "FileNotFoundError": ("File not found", "Check if the file exists"),
-        "PermissionError": ("Permission denied", "Check file permissions"),
-        "ConnectionError": ("Connection failed", "Check your internet connection"),
-        "TimeoutError": ("Request timed out", "Try again in a moment"),
-        "JSONDecodeError": ("Invalid data format", "The file may be corrupted"),
-        "KeyError": ("Missing configuration", "Check your settings"),
-        "ValueError": ("Invalid value", "Check your input"),
-    }
-    
-    if exc_type in friendly_messages:
-        user_msg, suggestion = friendly_messages[exc_type]
-        return f"❌ {user_msg}\n💡 {suggestion}"
-    
+
+    # Map common exceptions to prebuilt friendly messages
+    for exc_class, message in _FRIENDLY_MESSAGES:
+        if isinstance(exc, exc_class):
+            return message
+
     # Default formatting
-    return f"❌ {exc_type}: {exc_msg}"
+    return f"❌ {type(exc).__name__}: {exc}"
 
 
 def log_error_with_context(
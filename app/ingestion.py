@@ -1,9 +1,20 @@
 from __future__ import annotations
 
 import base64
+import io
 import logging
+import mmap
 import os
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import struct
+import threading
+from collections import OrderedDict
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+    wait,
+)
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Callable
@@ -17,14 +28,223 @@ from PyPDF2 import PdfReader
 load_dotenv()
 logger = logging.getLogger("rag")
 
-SUPPORTED_EXTENSIONS = {".txt", ".md", ".pdf", ".docx", ".csv", ".xlsx"}
-IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".webp", ".bmp", ".tiff", ".tif"}
-SUPPORTED_EXTENSIONS = SUPPORTED_EXTENSIONS | IMAGE_EXTENSIONS
+DOCUMENT_EXTENSIONS = frozenset({".txt", ".md", ".pdf", ".docx", ".csv", ".xlsx"})
+IMAGE_EXTENSIONS = frozenset({".jpg", ".jpeg", ".png", ".gif", ".webp", ".bmp", ".tiff", ".tif"})
+SUPPORTED_EXTENSIONS = DOCUMENT_EXTENSIONS | IMAGE_EXTENSIONS
+
+# For the scanner's hot loop: one C-level suffix check against the
+# whole tuple instead of splitting out the extension per entry
+_SUPPORTED_SUFFIXES = tuple(SUPPORTED_EXTENSIONS)
 
 # Minimum image dimensions to process (skip icons/thumbnails)
 MIN_IMAGE_WIDTH = 200
 MIN_IMAGE_HEIGHT = 200
 
+# Formats whose parsers burn CPU holding the GIL; these go to worker
+# processes while plain-text formats stay on threads (their cost is
+# the read itself)
+CPU_BOUND_EXTENSIONS = {".pdf", ".docx", ".xlsx"}
+
+# Text files above this size are read through mmap so the kernel pages
+# them in on demand instead of buffering the whole file twice
+_MMAP_THRESHOLD_BYTES = 1 << 20
+
+
+def _read_document(path_str: str) -> str:
+    """
+    Parse a non-image document to text.
+
+    Module-level (not a method) so it pickles cleanly into
+    ProcessPoolExecutor workers.
+    """
+    path = Path(path_str)
+    suffix = path.suffix.lower()
+    try:
+        if suffix in {".txt", ".md"}:
+            if path.stat().st_size > _MMAP_THRESHOLD_BYTES:
+                with open(path, "rb") as f, mmap.mmap(
+                    f.fileno(), 0, access=mmap.ACCESS_READ
+                ) as mm:
+                    return mm[:].decode("utf-8", "ignore")
+            return path.read_text(encoding="utf-8", errors="ignore")
+        if suffix == ".pdf":
+            reader = PdfReader(path_str)
+            return "\n".join(page.extract_text() or "" for page in reader.pages)
+        if suffix == ".docx":
+            doc = Document(path_str)
+            return "\n".join(p.text for p in doc.paragraphs)
+        if suffix == ".csv":
+            df = pd.read_csv(path)
+            return df.to_csv(index=False)
+        if suffix == ".xlsx":
+            df = pd.read_excel(path)
+            return df.to_csv(index=False)
+    except Exception as exc:
+        raise RuntimeError(f"Failed to read {path}") from exc
+
+    raise RuntimeError(f"Unsupported file type: {path}")
+
+
+def _scan_directory(dirpath: str) -> tuple[list[str], list[str]]:
+    """Scan one directory, returning (supported files, subdirectories)."""
+    files: list[str] = []
+    subdirs: list[str] = []
+    try:
+        with os.scandir(dirpath) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif (
+                        entry.is_file()
+                        and entry.name.lower().endswith(_SUPPORTED_SUFFIXES)
+                        # DirEntry caches the stat from the directory
+                        # read, so skipping empties costs no syscall
+                        # and saves an open/parse/close later
+                        and entry.stat().st_size > 0
+                    ):
+                        files.append(entry.path)
+                except OSError:
+                    continue
+    except OSError:
+        pass
+    return files, subdirs
+
+
+def _scan_supported(docs_dir: Path) -> list[Path]:
+    """
+    Find all supported files under docs_dir.
+
+    os.scandir hands back DirEntry objects whose type checks come from
+    the directory read itself — no per-file stat syscall like rglob —
+    and subdirectories fan out across a small thread pool so deep
+    trees scan in parallel.
+    """
+    found: list[str] = []
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        pending = {pool.submit(_scan_directory, str(docs_dir))}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                files, subdirs = future.result()
+                found.extend(files)
+                for subdir in subdirs:
+                    pending.add(pool.submit(_scan_directory, subdir))
+    return [Path(p) for p in found]
+
+
+def _fast_image_size(path: Path) -> tuple[int, int] | None:
+    """
+    Read image dimensions from the file header alone.
+
+    Covers PNG, GIF, JPEG, and WebP with a handful of bytes; anything
+    unrecognized returns None so the caller can fall back to PIL.
+    """
+    try:
+        with open(path, "rb") as f:
+            return _image_size_from_stream(f)
+    except OSError:
+        return None
+
+
+def _image_size_from_stream(f) -> tuple[int, int] | None:
+    """Header-based dimension read over any seekable binary stream."""
+    try:
+        head = f.read(32)
+        if head.startswith(b"\x89PNG\r\n\x1a\n") and head[12:16] == b"IHDR":
+            return struct.unpack(">II", head[16:24])
+        if head[:6] in (b"GIF87a", b"GIF89a"):
+            return struct.unpack("<HH", head[6:10])
+        if head.startswith(b"RIFF") and head[8:12] == b"WEBP":
+            return _webp_size(head)
+        if head.startswith(b"\xff\xd8"):
+            return _jpeg_size(f)
+    except (OSError, struct.error):
+        pass
+    return None
+
+
+def _webp_size(head: bytes) -> tuple[int, int] | None:
+    """Dimensions from a WebP header (VP8/VP8L/VP8X chunk variants)."""
+    chunk = head[12:16]
+    if chunk == b"VP8X":
+        width = int.from_bytes(head[24:27], "little") + 1
+        height = int.from_bytes(head[27:30], "little") + 1
+        return (width, height)
+    if chunk == b"VP8 ":
+        width = int.from_bytes(head[26:28], "little") & 0x3FFF
+        height = int.from_bytes(head[28:30], "little") & 0x3FFF
+        return (width, height)
+    if chunk == b"VP8L":
+        bits = int.from_bytes(head[21:25], "little")
+        width = (bits & 0x3FFF) + 1
+        height = ((bits >> 14) & 0x3FFF) + 1
+        return (width, height)
+    return None
+
+
+def _jpeg_size(f) -> tuple[int, int] | None:
+    """Walk JPEG segment markers to the SOF frame holding dimensions."""
+    f.seek(2)
+    while True:
+        byte = f.read(1)
+        if not byte:
+            return None
+        if byte != b"\xff":
+            continue
+        marker = f.read(1)
+        while marker == b"\xff":
+            marker = f.read(1)
+        if not marker:
+            return None
+        code = marker[0]
+        # Standalone markers have no length field
+        if code in (0x01, 0xD8) or 0xD0 <= code <= 0xD7:
+            continue
+        length_bytes = f.read(2)
+        if len(length_bytes) < 2:
+            return None
+        (length,) = struct.unpack(">H", length_bytes)
+        # SOF0-SOF15 excluding DHT/JPG/DAC carry the frame dimensions
+        if 0xC0 <= code <= 0xCF and code not in (0xC4, 0xC8, 0xCC):
+            body = f.read(5)
+            if len(body) < 5:
+                return None
+            height, width = struct.unpack(">HH", body[1:5])
+            return (width, height)
+        f.seek(length - 2, 1)
+
+
+# Parsed-text cache keyed by (path, mtime_ns, size): a re-index or a
+# chunking pass touching the same unchanged file should not pay for a
+# second parse. Bounded by total text size, LRU-evicted.
+_READ_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+_read_cache: OrderedDict[tuple[str, int, int], str] = OrderedDict()
+_read_cache_bytes = 0
+_read_cache_lock = threading.Lock()
+
+
+def _read_document_cached(path_str: str, mtime_ns: int, size: int) -> str:
+    """Parse a document, serving repeats of unchanged files from cache."""
+    global _read_cache_bytes
+    key = (path_str, mtime_ns, size)
+    with _read_cache_lock:
+        if key in _read_cache:
+            _read_cache.move_to_end(key)
+            return _read_cache[key]
+
+    content = _read_document(path_str)
+
+    with _read_cache_lock:
+        if key not in _read_cache:
+            _read_cache[key] = content
+            _read_cache_bytes += len(content)
+            while _read_cache_bytes > _READ_CACHE_MAX_BYTES and len(_read_cache) > 1:
+                _, evicted = _read_cache.popitem(last=False)
+                _read_cache_bytes -= len(evicted)
+    return content
+
 
 @dataclass(frozen=True)
 class IngestedDocument:
@@ -77,6 +297,13 @@ class DocumentIngester:
         Check if image meets minimum dimension requirements.
         Skips small icons, thumbnails, and UI elements.
         """
+        # Common formats carry dimensions in the first bytes of the
+        # header — read those instead of handing every file to PIL
+        size = _fast_image_size(path)
+        if size is not None:
+            width, height = size
+            return width >= MIN_IMAGE_WIDTH and height >= MIN_IMAGE_HEIGHT
+
         try:
             from PIL import Image
             with Image.open(path) as img:
@@ -92,6 +319,21 @@ class DocumentIngester:
         except Exception:
             return False
 
+    def _image_bytes_large_enough(self, data: bytes, path: Path) -> bool:
+        """Dimension check against bytes already read off disk."""
+        size = _image_size_from_stream(io.BytesIO(data))
+        if size is None:
+            try:
+                from PIL import Image
+                with Image.open(io.BytesIO(data)) as img:
+                    size = img.size
+            except ImportError:
+                return len(data) > 50 * 1024  # > 50KB likely not an icon
+            except Exception:
+                return False
+        width, height = size
+        return width >= MIN_IMAGE_WIDTH and height >= MIN_IMAGE_HEIGHT
+
     def _read_image(self, path: Path) -> str:
         """
         Process an image using OpenAI's vision API.
@@ -108,8 +350,16 @@ class DocumentIngester:
             logger.debug("Skipping image (local-only mode): %s", path.name)
             return ""
         
-        # Check image dimensions first (skip small icons)
-        if not self._is_image_large_enough(path):
+        # One read serves both the dimension check and the upload
+        # payload — no second open for accepted images
+        try:
+            with open(path, "rb") as f:
+                raw = f.read()
+        except OSError as e:
+            logger.warning("Failed to read image %s: %s", path.name, e)
+            return ""
+
+        if not self._image_bytes_large_enough(raw, path):
             logger.debug("Skipping small image (icon/thumbnail): %s", path.name)
             return ""
         
@@ -119,9 +369,7 @@ class DocumentIngester:
             return ""
 
         try:
-            # Read and encode image as base64
-            with open(path, "rb") as f:
-                image_data = base64.b64encode(f.read()).decode("utf-8")
+            image_data = base64.b64encode(raw).decode("utf-8")
 
             # Determine MIME type
             suffix = path.suffix.lower()
@@ -193,11 +441,7 @@ Format your response as natural prose that will be searchable. Be thorough but c
                 "Create it and add files before indexing."
             )
 
-        files = [
-            path
-            for path in self.docs_dir.rglob("*")
-            if path.is_file() and path.suffix.lower() in SUPPORTED_EXTENSIONS
-        ]
+        files = _scan_supported(self.docs_dir)
         if not files:
             raise RuntimeError(
                 f"No supported documents found in {self.docs_dir}. "
@@ -318,15 +562,9 @@ Format your response as natural prose that will be searchable. Be thorough but c
             return None
         
         if parallel and len(file_paths) > 1:
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                futures = {
-                    executor.submit(process_file, path, i): path
-                    for i, path in enumerate(file_paths)
-                }
-                for future in as_completed(futures):
-                    result = future.result()
-                    if result:
-                        documents.append(result)
+            documents = self._ingest_files_parallel(
+                file_paths, max_workers, progress_callback
+            )
         else:
             for i, path in enumerate(file_paths):
                 result = process_file(path, i)
@@ -342,26 +580,88 @@ Format your response as natural prose that will be searchable. Be thorough but c
             for doc in documents
         ]
 
+    def _ingest_files_parallel(
+        self,
+        file_paths: list[Path],
+        max_workers: int,
+        progress_callback: Callable[[str, int, int], None] | None,
+    ) -> list[IngestedDocument]:
+        """
+        Process files on two pools routed by format.
+
+        PDF/DOCX/XLSX parsing is CPU-bound and holds the GIL, so those
+        files go through a process pool; text-like formats and images
+        (which wait on I/O or the vision API) stay on threads. Worker
+        counts can be forced with the INGEST_N_THREADS env var. The
+        progress callback runs on the calling thread as futures
+        complete.
+        """
+        total = len(file_paths)
+        env_workers = int(os.getenv("INGEST_N_THREADS", "0"))
+        thread_workers = env_workers or max_workers
+
+        cpu_files = [p for p in file_paths if p.suffix.lower() in CPU_BOUND_EXTENSIONS]
+        io_files = [p for p in file_paths if p.suffix.lower() not in CPU_BOUND_EXTENSIONS]
+
+        documents: list[IngestedDocument] = []
+        done = 0
+        futures: dict = {}
+
+        thread_pool = ThreadPoolExecutor(max_workers=thread_workers)
+        process_pool = None
+        try:
+            for path in io_files:
+                futures[thread_pool.submit(self._read_file, path)] = path
+            if cpu_files:
+                process_workers = env_workers or max(
+                    1, min(len(cpu_files), (os.cpu_count() or 2) - 1)
+                )
+                process_pool = ProcessPoolExecutor(max_workers=process_workers)
+                for path in cpu_files:
+                    futures[process_pool.submit(_read_document, str(path))] = path
+
+            for future in as_completed(futures):
+                path = futures[future]
+                done += 1
+                if progress_callback:
+                    progress_callback(path.name, done, total)
+                try:
+                    content = future.result()
+                except Exception as e:
+                    logger.warning("Failed to process %s: %s", path.name, e)
+                    continue
+                if content.strip():
+                    documents.append(
+                        IngestedDocument(
+                            filename=path.name,
+                            filepath=str(path),
+                            content=content,
+                        )
+                    )
+        finally:
+            thread_pool.shutdown()
+            if process_pool is not None:
+                process_pool.shutdown()
+
+        return documents
+
     def _read_file(self, path: Path) -> str:
         suffix = path.suffix.lower()
-        try:
-            if suffix in {".txt", ".md"}:
-                return path.read_text(encoding="utf-8", errors="ignore")
-            if suffix == ".pdf":
-                reader = PdfReader(str(path))
-                return "\n".join(page.extract_text() or "" for page in reader.pages)
-            if suffix == ".docx":
-                doc = Document(str(path))
-                return "\n".join(p.text for p in doc.paragraphs)
-            if suffix == ".csv":
-                df = pd.read_csv(path)
-                return df.to_csv(index=False)
-            if suffix == ".xlsx":
-                df = pd.read_excel(path)
-                return df.to_csv(index=False)
-            if suffix in IMAGE_EXTENSIONS:
+        if suffix in IMAGE_EXTENSIONS:
+            try:
                 return self._read_image(path)
-        except Exception as exc:
+            except Exception as exc:
+                raise RuntimeError(f"Failed to read {path}") from exc
+        try:
+            stat = path.stat()
+        except OSError as exc:
             raise RuntimeError(f"Failed to read {path}") from exc
+        return _read_document_cached(str(path), stat.st_mtime_ns, stat.st_size)
 
-        raise RuntimeError(f"Unsupported file type: {path}")
+    @staticmethod
+    def clear_read_cache() -> None:
+        """Drop all cached parsed text (e.g. before a manifest rescan)."""
+        global _read_cache_bytes
+        with _read_cache_lock:
+            _read_cache.clear()
+            _read_cache_bytes = 0
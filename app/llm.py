@@ -6,20 +6,162 @@ This module handles all LLM interactions for the answer layer.
 """
 from __future__ import annotations
 
+import hashlib
+import io
 import json
 import os
 import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
 from typing import Generator, Callable
 
 from dotenv import load_dotenv
 from openai import OpenAI
 
+from app.config import DATA_DIR, ensure_data_dir
+
+try:
+    import orjson
+except ImportError:  # optional speedup, stdlib json works fine
+    orjson = None
+
 load_dotenv()
 logger = logging.getLogger("rag")
 
+
+def _json_loads(content: str):
+    """Parse JSON with orjson when available (2-3x faster than stdlib)."""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+# Strips ```/```json fences in one C-level match instead of splitting
+# the whole response into lines
+_FENCE_RE = re.compile(r"^```(?:json)?\s*\n(.*?)\n```\s*$", re.DOTALL)
+
+
+def _strip_code_fence(content: str) -> str:
+    """Remove a surrounding markdown code fence, if any."""
+    m = _FENCE_RE.match(content)
+    return m.group(1).strip() if m else content
+
+
 _client: OpenAI | None = None
 
 
+class ExtractionCache:
+    """
+    Persistent cache for extraction results keyed by SHA-256(query, chunk).
+
+    Extraction runs at temperature 0, so a repeated (query, chunk) pair
+    would get the same answer back from GPT — a cache hit replaces the
+    network call with a dict lookup. Entries persist to a JSON file in
+    the data directory so repeat queries stay free across sessions.
+
+    Capped at MAX_ENTRIES with least-recently-used eviction; set
+    EXTRACTION_CACHE_DISABLED=1 to bypass the cache entirely.
+    """
+
+    MAX_ENTRIES = 10_000
+
+    def __init__(self, cache_path=None):
+        self.cache_path = cache_path or (DATA_DIR / "extraction_cache.json")
+        self._entries: dict[str, dict] | None = None
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def _disabled() -> bool:
+        return bool(os.environ.get("EXTRACTION_CACHE_DISABLED"))
+
+    @staticmethod
+    def _key(query: str, chunk_text: str) -> str:
+        return hashlib.sha256((query + "\x00" + chunk_text).encode("utf-8")).hexdigest()
+
+    def _load(self) -> dict[str, dict]:
+        if self._entries is None:
+            try:
+                with open(self.cache_path, "rb") as f:
+                    self._entries = _json_loads(f.read())
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def get(self, query: str, chunk_text: str) -> dict | None:
+        """Look up a cached result, or None on a miss."""
+        if self._disabled():
+            return None
+        entries = self._load()
+        key = self._key(query, chunk_text)
+        result = entries.get(key)
+        if result is None:
+            self._misses += 1
+            return None
+        self._hits += 1
+        # Reinsert so dict order doubles as recency order for eviction
+        entries[key] = entries.pop(key)
+        return dict(result)
+
+    def put(self, query: str, chunk_text: str, result: dict) -> None:
+        """Store a result and persist the cache to disk."""
+        self.put_many([(query, chunk_text, result)])
+
+    def put_many(self, items) -> None:
+        """Store several results with a single disk write."""
+        if self._disabled() or not items:
+            return
+        entries = self._load()
+        for query, chunk_text, result in items:
+            entries[self._key(query, chunk_text)] = result
+        while len(entries) > self.MAX_ENTRIES:
+            entries.pop(next(iter(entries)))
+        try:
+            ensure_data_dir()
+            if orjson is not None:
+                with open(self.cache_path, "wb") as f:
+                    f.write(orjson.dumps(self._entries))
+            else:
+                with open(self.cache_path, "w", encoding="utf-8") as f:
+                    json.dump(self._entries, f)
+        except OSError as e:
+            logger.warning("Failed to persist extraction cache: %s", e)
+
+    def stats(self) -> dict:
+        """Hit-rate statistics for monitoring."""
+        total = self._hits + self._misses
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": self._hits / total if total else 0.0,
+            "entries": len(self._load()),
+        }
+
+
+_extraction_cache = ExtractionCache()
+
+
+def _build_http_client():
+    """
+    Build a pooled, keep-alive httpx client for the OpenAI SDK.
+
+    Keeping TLS sessions alive across calls saves a handshake per
+    request, which matters for the streaming and batch-extraction
+    paths that fire several requests in a row. Returns None when
+    httpx is unavailable so the SDK default is used instead.
+    """
+    try:
+        import httpx
+    except ImportError:
+        return None
+
+    return httpx.Client(
+        transport=httpx.HTTPTransport(retries=2),
+        limits=httpx.Limits(max_connections=16, max_keepalive_connections=16),
+        timeout=30.0,
+    )
+
+
 def get_client() -> OpenAI:
     """Get or create OpenAI client (singleton)."""
     global _client
@@ -29,33 +171,24 @@ def get_client() -> OpenAI:
             raise RuntimeError("OPENAI_API_KEY not found in .env")
         # Strip whitespace in case of formatting issues
         api_key = api_key.strip()
-        _client = OpenAI(api_key=api_key)
+        _client = OpenAI(api_key=api_key, http_client=_build_http_client())
     return _client
 
 
-def extract_answer_from_chunk(query: str, chunk_text: str) -> dict:
-    """
-    Use GPT to extract the smallest answer span from a chunk.
-    
-    This is the core extractive QA call. The model is instructed to:
-    - Copy the smallest span that answers the question
-    - Never invent facts not in the text
-    - Return "NONE" if no answer is present
-    
-    Returns:
-        {"answer": str or "NONE", "confidence": float 0-1}
-    """
-    client = get_client()
-    
-    system_prompt = """You are an extraction engine for a personal factual recall system.
+
+# Largest number of chunks packed into a single batched extraction
+# prompt; bigger retrievals fan out over concurrent group calls
+BATCH_GROUP_SIZE = 8
+
+_SYSTEM_EXTRACT = """You are an extraction engine for a personal factual recall system.
 You ONLY extract short answers that are explicitly stated in the given text.
 You NEVER invent or infer facts not literally present.
 You respond ONLY in valid JSON format."""
 
-    user_prompt = f"""Question: {query}
+_USER_EXTRACT_TEMPLATE = """Question: {query}
 
 Text:
-{chunk_text}
+{chunk}
 
 Instructions:
 - If the text contains a direct answer, copy the smallest possible span that answers the question.
@@ -67,37 +200,57 @@ Instructions:
 Respond in JSON ONLY with this exact format:
 {{"answer": "<copied span or NONE>", "confidence": <number between 0.0 and 1.0>}}"""
 
+
+def extract_answer_from_chunk(query: str, chunk_text: str) -> dict:
+    """
+    Use GPT to extract the smallest answer span from a chunk.
+    
+    This is the core extractive QA call. The model is instructed to:
+    - Copy the smallest span that answers the question
+    - Never invent facts not in the text
+    - Return "NONE" if no answer is present
+    
+    Returns:
+        {"answer": str or "NONE", "confidence": float 0-1}
+    """
+    cached = _extraction_cache.get(query, chunk_text)
+    if cached is not None:
+        return cached
+
+    client = get_client()
+
+    user_prompt = _USER_EXTRACT_TEMPLATE.format(query=query, chunk=chunk_text)
+
     try:
         response = client.chat.completions.create(
             model="gpt-4o-mini",
             messages=[
-                {"role": "system", "content": system_prompt},
+                {"role": "system", "content": _SYSTEM_EXTRACT},
                 {"role": "user", "content": user_prompt},
             ],
             temperature=0.0,
             max_tokens=150,
+            # Server-side JSON mode: guaranteed valid JSON, no fences
+            response_format={"type": "json_object"},
         )
-        
+
         content = response.choices[0].message.content.strip()
-        
-        # Handle markdown code blocks if present
-        if content.startswith("```"):
-            lines = content.split("\n")
-            content = "\n".join(lines[1:-1]) if len(lines) > 2 else content
-            content = content.strip()
-        
+
         # Parse JSON response
-        result = json.loads(content)
+        result = _json_loads(content)
         
         answer = result.get("answer", "NONE")
         confidence = float(result.get("confidence", 0.0))
         
         # Validate
         if not answer or answer.upper() == "NONE":
-            return {"answer": "NONE", "confidence": 0.0}
-        
-        return {"answer": answer, "confidence": min(max(confidence, 0.0), 1.0)}
-        
+            result = {"answer": "NONE", "confidence": 0.0}
+        else:
+            result = {"answer": answer, "confidence": min(max(confidence, 0.0), 1.0)}
+
+        _extraction_cache.put(query, chunk_text, result)
+        return result
+
     except json.JSONDecodeError as e:
         logger.warning("LLM returned invalid JSON: %s", e)
         return {"answer": "NONE", "confidence": 0.0}
@@ -106,6 +259,122 @@ Respond in JSON ONLY with this exact format:
         return {"answer": "NONE", "confidence": 0.0}
 
 
+def extract_answers_batch(query: str, chunks: list[str]) -> list[dict]:
+    """
+    Extract answers for several chunks with a single GPT call.
+
+    Packs all chunks into one numbered prompt instead of paying one
+    HTTP round-trip per chunk, so k chunks cost one network RTT.
+
+    Returns:
+        List of {"answer": str or "NONE", "confidence": float} dicts,
+        one per input chunk, in the same order.
+    """
+    if not chunks:
+        return []
+
+    # Chunks repeat across queries; serve cached (query, chunk) pairs
+    # from the persistent extraction cache and only send the misses
+    cached = [_extraction_cache.get(query, chunk) for chunk in chunks]
+    miss_positions = [i for i, result in enumerate(cached) if result is None]
+    if not miss_positions:
+        return cached
+    if len(chunks) == 1:
+        return [extract_answer_from_chunk(query, chunks[0])]
+
+    client = get_client()
+
+    # Very large retrievals get split into groups of BATCH_GROUP_SIZE
+    # so one prompt never balloons past what the model extracts from
+    # reliably; the group calls overlap their round-trips in a small
+    # thread pool, so wall time stays roughly one RTT
+    miss_chunks = [chunks[i] for i in miss_positions]
+    groups = [
+        miss_chunks[i : i + BATCH_GROUP_SIZE]
+        for i in range(0, len(miss_chunks), BATCH_GROUP_SIZE)
+    ]
+    if len(groups) == 1:
+        miss_results = _extract_batch_group(client, query, groups[0])
+    else:
+        with ThreadPoolExecutor(max_workers=min(len(groups), 8)) as pool:
+            futures = [
+                pool.submit(_extract_batch_group, client, query, group)
+                for group in groups
+            ]
+            miss_results = [result for f in futures for result in f.result()]
+
+    no_answer = {"answer": "NONE", "confidence": 0.0}
+    results = [dict(no_answer) if r is None else r for r in cached]
+    for pos, result in zip(miss_positions, miss_results):
+        results[pos] = dict(result)
+    _extraction_cache.put_many(
+        [(query, chunk, result) for chunk, result in zip(miss_chunks, miss_results)]
+    )
+    return results
+
+
+def _extract_batch_group(client: OpenAI, query: str, miss_chunks: list[str]) -> list[dict]:
+    """Run one batched extraction call over a group of chunks.
+
+    Returns one result dict per chunk; any failure degrades the whole
+    group to NONE rather than raising, so a bad group can't sink the
+    other concurrently running groups.
+    """
+    numbered = "\n\n".join(f"[{i}]\n{chunk}" for i, chunk in enumerate(miss_chunks, start=1))
+    user_prompt = f"""Question: {query}
+
+Text passages:
+{numbered}
+
+Instructions:
+- For EACH numbered passage, if it contains a direct answer, copy the smallest possible span that answers the question.
+- Prefer a short phrase or a single simple sentence (≤20 words).
+- Do NOT summarize the passages.
+- If a passage does not clearly contain the answer, use EXACTLY "NONE" for it.
+
+Respond in JSON ONLY as an array with one entry per passage:
+[{{"i": 1, "answer": "<copied span or NONE>", "confidence": <number between 0.0 and 1.0>}}, ...]"""
+
+    no_answer = {"answer": "NONE", "confidence": 0.0}
+    miss_results = [dict(no_answer) for _ in miss_chunks]
+
+    try:
+        response = client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[
+                {"role": "system", "content": _SYSTEM_EXTRACT},
+                {"role": "user", "content": user_prompt},
+            ],
+            temperature=0.0,
+            max_tokens=150 * len(miss_chunks),
+        )
+
+        content = response.choices[0].message.content.strip()
+
+        # Handle markdown code blocks if present
+        content = _strip_code_fence(content)
+
+        entries = _json_loads(content)
+
+        # Map entries back by index; missing or malformed entries become NONE
+        for entry in entries:
+            idx = int(entry.get("i", 0)) - 1
+            if not 0 <= idx < len(miss_chunks):
+                continue
+            answer = entry.get("answer", "NONE")
+            confidence = float(entry.get("confidence", 0.0))
+            if not answer or str(answer).upper() == "NONE":
+                continue
+            miss_results[idx] = {"answer": answer, "confidence": min(max(confidence, 0.0), 1.0)}
+
+    except json.JSONDecodeError as e:
+        logger.warning("LLM returned invalid JSON for batch extraction: %s", e)
+    except Exception as e:
+        logger.warning("LLM batch extraction failed: %s", e)
+
+    return miss_results
+
+
 def compress_answer(answer: str) -> str:
     """
     Use GPT to compress a long answer into ≤1 sentence.
@@ -218,19 +487,19 @@ Answer:"""
             stream=True,
         )
         
-        full_response = []
-        
+        buf = io.StringIO()
+
         for chunk in stream:
-            if chunk.choices[0].delta.content:
-                token = chunk.choices[0].delta.content
-                full_response.append(token)
-                
+            token = chunk.choices[0].delta.content
+            if token:
+                buf.write(token)
+
                 if on_token:
                     on_token(token)
-                
+
                 yield token
-        
-        return "".join(full_response)
+
+        return buf.getvalue()
         
     except Exception as e:
         logger.warning("Streaming failed: %s", e)
@@ -257,13 +526,13 @@ def stream_answer_with_callback(
         on_error: Called if an error occurs
     """
     try:
-        full_answer = []
+        buf = io.StringIO()
         for token in stream_answer(query, context):
-            full_answer.append(token)
+            buf.write(token)
             on_token(token)
-        
+
         if on_complete:
-            on_complete("".join(full_answer))
+            on_complete(buf.getvalue())
             
     except Exception as e:
         logger.error("Stream error: %s", e)
@@ -282,6 +551,10 @@ def extract_answer_streaming(
     Same as extract_answer_from_chunk but streams the response.
     Returns the same dict format for compatibility.
     """
+    cached = _extraction_cache.get(query, chunk_text)
+    if cached is not None:
+        return cached
+
     client = get_client()
     
     system_prompt = """You are an extraction engine. Extract the answer from the text.
@@ -306,32 +579,32 @@ Extract the shortest answer span. JSON only:"""
             stream=True,
         )
         
-        full_response = []
-        
+        buf = io.StringIO()
+
         for chunk in stream:
-            if chunk.choices[0].delta.content:
-                token = chunk.choices[0].delta.content
-                full_response.append(token)
+            token = chunk.choices[0].delta.content
+            if token:
+                buf.write(token)
                 if on_token:
                     on_token(token)
-        
-        content = "".join(full_response).strip()
+
+        content = buf.getvalue().strip()
         
         # Parse JSON
-        if content.startswith("```"):
-            lines = content.split("\n")
-            content = "\n".join(lines[1:-1]) if len(lines) > 2 else content
-            content = content.strip()
-        
-        result = json.loads(content)
-        answer = result.get("answer", "NONE")
-        confidence = float(result.get("confidence", 0.0))
-        
+        content = _strip_code_fence(content)
+
+        parsed = _json_loads(content)
+        answer = parsed.get("answer", "NONE")
+        confidence = float(parsed.get("confidence", 0.0))
+
         if not answer or answer.upper() == "NONE":
-            return {"answer": "NONE", "confidence": 0.0}
-        
-        return {"answer": answer, "confidence": min(max(confidence, 0.0), 1.0)}
-        
+            result = {"answer": "NONE", "confidence": 0.0}
+        else:
+            result = {"answer": answer, "confidence": min(max(confidence, 0.0), 1.0)}
+
+        _extraction_cache.put(query, chunk_text, result)
+        return result
+
     except Exception as e:
         logger.warning("Streaming extraction failed: %s", e)
         return {"answer": "NONE", "confidence": 0.0}
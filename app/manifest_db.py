@@ -8,7 +8,12 @@ from __future__ import annotations
 
 import hashlib
 import logging
+import os
 import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
@@ -16,6 +21,61 @@ from typing import Generator
 
 logger = logging.getLogger("rag")
 
+try:
+    from blake3 import blake3 as _blake3
+except ImportError:  # falls back to stdlib BLAKE2b when blake3 isn't installed
+    _blake3 = None
+
+
+# Column list shared by table creation and the WITHOUT ROWID rebuild.
+# STRICT (SQLite 3.37+) makes the declared types binding so a stray
+# string can't sneak into an INTEGER column.
+_FILES_COLUMNS_SQL = """
+    filepath TEXT PRIMARY KEY,
+    filename TEXT NOT NULL,
+    file_hash TEXT,
+    mtime REAL,
+    mtime_ns INTEGER,
+    size INTEGER,
+    indexed_at INTEGER,
+    chunk_count INTEGER NOT NULL DEFAULT 0,
+    extension TEXT
+"""
+
+_FILES_INDEXES_SQL = """
+    CREATE INDEX IF NOT EXISTS idx_files_mtime ON files(mtime);
+    CREATE INDEX IF NOT EXISTS idx_files_indexed_at ON files(indexed_at);
+    CREATE INDEX IF NOT EXISTS idx_files_ext ON files(extension);
+"""
+
+# Clustering on the filepath primary key (WITHOUT ROWID) stores the
+# row in the key's B-tree: one traversal per lookup instead of two,
+# and the path string is no longer stored twice
+_FILES_TABLE_OPTIONS = (
+    "WITHOUT ROWID, STRICT"
+    if sqlite3.sqlite_version_info >= (3, 37, 0)
+    else "WITHOUT ROWID"
+)
+
+
+def _epoch_to_iso(value) -> str | None:
+    """Format epoch seconds as ISO-8601 for JSON boundaries."""
+    if value is None:
+        return None
+    return datetime.fromtimestamp(value).isoformat()
+
+
+def _to_epoch(value) -> int | None:
+    """Coerce an indexed_at value (epoch int or ISO text) to epoch seconds."""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    try:
+        return int(datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp())
+    except ValueError:
+        return None
+
 
 class SQLiteManifest:
     """
@@ -29,38 +89,114 @@ class SQLiteManifest:
     """
     
     SCHEMA_VERSION = 1
-    
+
+    # Rows cached by get_file during a scan; sized for one directory's
+    # worth of hot filepaths
+    FILE_CACHE_SIZE = 1024
+
     def __init__(self, db_path: Path):
         self.db_path = db_path
+        # One long-lived connection per thread: opening a connection
+        # re-parses the schema and re-applies pragmas, which is pure
+        # overhead when called once per file in an indexing loop
+        self._local = threading.local()
+        # During a scan each file is looked up twice (needs_indexing,
+        # then mark_indexed); a small LRU over rows halves those SQL
+        # round-trips. Writes invalidate their keys.
+        self._file_cache: OrderedDict[str, dict | None] = OrderedDict()
+        self._cache_lock = threading.Lock()
         self._init_db()
     
     def _init_db(self) -> None:
         """Initialize the database schema."""
         with self._connection() as conn:
-            conn.executescript("""
+            # WAL is persistent in the database file: writers no longer
+            # block readers and each commit costs one fsync instead of two
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            conn.executescript(f"""
                 CREATE TABLE IF NOT EXISTS schema_version (
                     version INTEGER PRIMARY KEY
                 );
                 
                 CREATE TABLE IF NOT EXISTS files (
-                    filepath TEXT PRIMARY KEY,
-                    filename TEXT NOT NULL,
-                    file_hash TEXT,
-                    mtime REAL,
-                    size INTEGER,
-                    indexed_at TEXT,
-                    chunk_count INTEGER DEFAULT 0
-                );
+                    {_FILES_COLUMNS_SQL}
+                ) {_FILES_TABLE_OPTIONS};
                 
                 CREATE TABLE IF NOT EXISTS metadata (
                     key TEXT PRIMARY KEY,
                     value TEXT
                 );
-                
-                CREATE INDEX IF NOT EXISTS idx_files_mtime ON files(mtime);
-                CREATE INDEX IF NOT EXISTS idx_files_indexed_at ON files(indexed_at);
             """)
             
+            # Migrate pre-existing tables that lack the newer columns
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(files)")}
+            if "mtime_ns" not in columns:
+                conn.execute("ALTER TABLE files ADD COLUMN mtime_ns INTEGER")
+            if "extension" not in columns:
+                conn.execute("ALTER TABLE files ADD COLUMN extension TEXT")
+            # Repair NULL extensions on every startup, not just when
+            # the column is first added: rows written by older code or
+            # imports predating the column would otherwise stay
+            # invisible to the extension queries. Free when there is
+            # nothing to fix.
+            rows = conn.execute(
+                "SELECT filepath FROM files WHERE extension IS NULL"
+            ).fetchall()
+            if rows:
+                conn.executemany(
+                    "UPDATE files SET extension = ? WHERE filepath = ?",
+                    [(Path(r["filepath"]).suffix.lower(), r["filepath"]) for r in rows],
+                )
+
+            # Rebuild legacy tables: rowid tables become clustered
+            # WITHOUT ROWID, and ISO-8601 indexed_at text becomes epoch
+            # seconds (indexes follow the table through rename/drop,
+            # so they are recreated afterwards)
+            table_sql = conn.execute(
+                "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'files'"
+            ).fetchone()
+            indexed_at_type = next(
+                (row["type"] for row in conn.execute("PRAGMA table_info(files)")
+                 if row["name"] == "indexed_at"),
+                None,
+            )
+            if table_sql and (
+                "WITHOUT ROWID" not in table_sql["sql"].upper()
+                or indexed_at_type != "INTEGER"
+            ):
+                # ISO timestamps were written with local-time
+                # datetime.now(), so convert them in Python where
+                # fromisoformat applies the same local rules
+                iso_rows = conn.execute(
+                    "SELECT filepath, indexed_at FROM files"
+                    " WHERE typeof(indexed_at) = 'text'"
+                ).fetchall()
+                conn.executescript(f"""
+                    ALTER TABLE files RENAME TO files_legacy;
+                    CREATE TABLE files (
+                        {_FILES_COLUMNS_SQL}
+                    ) {_FILES_TABLE_OPTIONS};
+                    INSERT INTO files
+                        SELECT filepath, filename, file_hash, mtime, mtime_ns,
+                               size,
+                               CASE typeof(indexed_at)
+                                   WHEN 'integer' THEN indexed_at
+                                   ELSE NULL
+                               END,
+                               COALESCE(chunk_count, 0), extension
+                        FROM files_legacy;
+                    DROP TABLE files_legacy;
+                """)
+                conn.executemany(
+                    "UPDATE files SET indexed_at = ? WHERE filepath = ?",
+                    [(_to_epoch(r["indexed_at"]), r["filepath"]) for r in iso_rows],
+                )
+
+            # Indexes last: the extension column may only just have
+            # been added, and the rebuild drops them with the old table
+            conn.executescript(_FILES_INDEXES_SQL)
+
             # Check/set schema version
             cursor = conn.execute("SELECT version FROM schema_version LIMIT 1")
             row = cursor.fetchone()
@@ -70,43 +206,83 @@ class SQLiteManifest:
                     (self.SCHEMA_VERSION,)
                 )
     
+    def _get_conn(self) -> sqlite3.Connection:
+        """Get (or lazily create) this thread's persistent connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path))
+            conn.row_factory = sqlite3.Row
+            # Per-connection tuning: NORMAL sync is safe under WAL, and
+            # the busy timeout stops concurrent scans from failing fast
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            conn.execute("PRAGMA cache_size=-20000")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute("PRAGMA mmap_size=268435456")
+            self._local.conn = conn
+        return conn
+
     @contextmanager
     def _connection(self) -> Generator[sqlite3.Connection, None, None]:
-        """Get a database connection with proper cleanup."""
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        conn = sqlite3.connect(str(self.db_path))
-        conn.row_factory = sqlite3.Row
+        """Yield the thread-local connection inside a transaction."""
+        conn = self._get_conn()
         try:
             yield conn
             conn.commit()
         except Exception:
             conn.rollback()
             raise
-        finally:
+
+    def close(self) -> None:
+        """Close this thread's connection (other threads close their own)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
             conn.close()
+            self._local.conn = None
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
     
     # ========================================================================
     # File Operations
     # ========================================================================
     
     def get_file(self, filepath: str) -> dict | None:
-        """Get file info by path. O(1) lookup."""
+        """Get file info by path. O(1) lookup, LRU-cached."""
+        with self._cache_lock:
+            if filepath in self._file_cache:
+                self._file_cache.move_to_end(filepath)
+                cached = self._file_cache[filepath]
+                return dict(cached) if cached else None
+
         with self._connection() as conn:
             cursor = conn.execute(
                 "SELECT * FROM files WHERE filepath = ?",
                 (filepath,)
             )
             row = cursor.fetchone()
-            return dict(row) if row else None
-    
+        result = dict(row) if row else None
+
+        with self._cache_lock:
+            self._file_cache[filepath] = result
+            while len(self._file_cache) > self.FILE_CACHE_SIZE:
+                self._file_cache.popitem(last=False)
+        # Hand out a copy so callers can't mutate the cached row
+        return dict(result) if result else None
+
     def file_exists(self, filepath: str) -> bool:
         """Check if file is in manifest."""
-        with self._connection() as conn:
-            cursor = conn.execute(
-                "SELECT 1 FROM files WHERE filepath = ? LIMIT 1",
-                (filepath,)
-            )
-            return cursor.fetchone() is not None
+        return self.get_file(filepath) is not None
+
+    def _invalidate(self, *filepaths: str) -> None:
+        """Drop cached rows for paths that were just written."""
+        with self._cache_lock:
+            for fp in filepaths:
+                self._file_cache.pop(fp, None)
     
     def needs_indexing(self, filepath: Path) -> bool:
         """
@@ -127,13 +303,31 @@ class SQLiteManifest:
         try:
             stat = filepath.stat()
             
-            # Quick check: modification time
-            if stat.st_mtime != stored.get("mtime"):
-                # Verify with hash to avoid false positives
-                current_hash = self.compute_file_hash(filepath)
-                return current_hash != stored.get("file_hash")
-            
-            return False
+            # Quick check: modification time, at ns precision when the
+            # row has it (float mtimes round and force needless hashing)
+            stored_mtime_ns = stored.get("mtime_ns")
+            if stored_mtime_ns is not None:
+                mtime_unchanged = stat.st_mtime_ns == stored_mtime_ns
+            else:
+                mtime_unchanged = stat.st_mtime == stored.get("mtime")
+
+            if mtime_unchanged:
+                return False
+
+            # A different size means the content definitely changed —
+            # no need to read the file to prove it
+            if stat.st_size != stored.get("size"):
+                return True
+
+            # Same size but newer mtime (e.g. a touch): verify with a
+            # hash, using the algorithm that produced the stored value
+            # (legacy rows are unprefixed MD5)
+            stored_hash = stored.get("file_hash") or ""
+            algorithm = stored_hash.partition(":")[0] if ":" in stored_hash else "md5"
+            current_hash = self.compute_file_hash(filepath, algorithm=algorithm)
+            if ":" not in stored_hash:
+                current_hash = current_hash.partition(":")[2]
+            return current_hash != stored_hash
         except OSError:
             return False
     
@@ -149,21 +343,99 @@ class SQLiteManifest:
             
             with self._connection() as conn:
                 conn.execute("""
-                    INSERT OR REPLACE INTO files 
-                    (filepath, filename, file_hash, mtime, size, indexed_at, chunk_count)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    INSERT INTO files
+                    (filepath, filename, file_hash, mtime, mtime_ns, size, indexed_at, chunk_count, extension)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(filepath) DO UPDATE SET
+                        filename = excluded.filename,
+                        file_hash = excluded.file_hash,
+                        mtime = excluded.mtime,
+                        mtime_ns = excluded.mtime_ns,
+                        size = excluded.size,
+                        indexed_at = excluded.indexed_at,
+                        chunk_count = excluded.chunk_count,
+                        extension = excluded.extension
                 """, (
                     str(filepath),
                     filepath.name,
                     file_hash or self.compute_file_hash(filepath),
                     stat.st_mtime,
+                    stat.st_mtime_ns,
                     stat.st_size,
-                    datetime.now().isoformat(),
+                    int(time.time()),
                     chunk_count,
+                    filepath.suffix.lower(),
                 ))
+            self._invalidate(str(filepath))
         except OSError as e:
             logger.warning("Failed to mark file as indexed: %s", e)
     
+    def mark_indexed_batch(
+        self,
+        entries: list[tuple[Path, int, str | None]],
+    ) -> int:
+        """
+        Mark many files as indexed in a single transaction.
+
+        Row-at-a-time mark_indexed pays one commit (and fsync) per file;
+        batching stats and hashes everything first, then lands all rows
+        with one executemany and one commit.
+
+        Args:
+            entries: (filepath, chunk_count, file_hash or None) tuples
+
+        Returns:
+            Number of rows written
+        """
+        now = int(time.time())
+
+        # Hash files the caller didn't hash across worker processes;
+        # a full re-scan is embarrassingly parallel and hashing is the
+        # expensive part of this method
+        unhashed = [fp for fp, _, fh in entries if not fh]
+        hashes = self.compute_file_hashes_parallel(unhashed)
+
+        rows = []
+        for filepath, chunk_count, file_hash in entries:
+            try:
+                stat = filepath.stat()
+            except OSError as e:
+                logger.warning("Failed to mark file as indexed: %s", e)
+                continue
+            rows.append((
+                str(filepath),
+                filepath.name,
+                file_hash or hashes.get(str(filepath), ""),
+                stat.st_mtime,
+                stat.st_mtime_ns,
+                stat.st_size,
+                now,
+                chunk_count,
+                filepath.suffix.lower(),
+            ))
+
+        if not rows:
+            return 0
+
+        with self._connection() as conn:
+            conn.executemany("""
+                INSERT INTO files
+                (filepath, filename, file_hash, mtime, mtime_ns, size, indexed_at, chunk_count, extension)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(filepath) DO UPDATE SET
+                    filename = excluded.filename,
+                    file_hash = excluded.file_hash,
+                    mtime = excluded.mtime,
+                    mtime_ns = excluded.mtime_ns,
+                    size = excluded.size,
+                    indexed_at = excluded.indexed_at,
+                    chunk_count = excluded.chunk_count,
+                    extension = excluded.extension
+            """, rows)
+
+        self._invalidate(*(row[0] for row in rows))
+        return len(rows)
+
     def mark_deleted(self, filepath: Path) -> None:
         """Remove a file from the manifest."""
         with self._connection() as conn:
@@ -171,6 +443,7 @@ class SQLiteManifest:
                 "DELETE FROM files WHERE filepath = ?",
                 (str(filepath),)
             )
+        self._invalidate(str(filepath))
     
     def mark_deleted_batch(self, filepaths: list[str]) -> int:
         """Remove multiple files from manifest. Returns count deleted."""
@@ -179,51 +452,127 @@ class SQLiteManifest:
                 "DELETE FROM files WHERE filepath = ?",
                 [(fp,) for fp in filepaths]
             )
-            return cursor.rowcount
+            count = cursor.rowcount
+        self._invalidate(*filepaths)
+        return count
     
     # ========================================================================
     # Queries
     # ========================================================================
     
-    def get_all_files(self) -> list[dict]:
+    def iter_all_files(self) -> Generator[sqlite3.Row, None, None]:
+        """Yield all indexed files one row at a time.
+
+        fetchall-into-a-list doubles peak memory and stalls the caller
+        until the last row arrives; iterating the cursor keeps memory
+        flat and lets consumers short-circuit. Rows are sqlite3.Row —
+        dict-style row["column"] access without paying for a dict
+        allocation and per-column name hashing on every row.
+        """
+        cursor = self._get_conn().execute(
+            "SELECT * FROM files ORDER BY indexed_at DESC"
+        )
+        yield from cursor
+
+    def get_all_files(self) -> list[sqlite3.Row]:
         """Get all indexed files."""
-        with self._connection() as conn:
-            cursor = conn.execute(
-                "SELECT * FROM files ORDER BY indexed_at DESC"
-            )
-            return [dict(row) for row in cursor.fetchall()]
-    
-    def get_files_modified_since(self, since: datetime) -> list[dict]:
+        return list(self.iter_all_files())
+
+    def iter_files_modified_since(self, since: datetime) -> Generator[sqlite3.Row, None, None]:
+        """Yield files indexed after a certain date, one row at a time."""
+        cursor = self._get_conn().execute(
+            "SELECT * FROM files WHERE indexed_at > ? ORDER BY indexed_at DESC",
+            (int(since.timestamp()),)
+        )
+        yield from cursor
+
+    def get_files_modified_since(self, since: datetime) -> list[sqlite3.Row]:
         """Get files indexed after a certain date."""
-        with self._connection() as conn:
-            cursor = conn.execute(
-                "SELECT * FROM files WHERE indexed_at > ? ORDER BY indexed_at DESC",
-                (since.isoformat(),)
-            )
-            return [dict(row) for row in cursor.fetchall()]
-    
-    def get_files_by_extension(self, extension: str) -> list[dict]:
-        """Get files with a specific extension."""
+        return list(self.iter_files_modified_since(since))
+
+    def iter_files_by_extension(self, extension: str) -> Generator[sqlite3.Row, None, None]:
+        """Yield files with a specific extension, one row at a time."""
         # Ensure extension starts with dot
         if not extension.startswith("."):
             extension = "." + extension
-        
-        with self._connection() as conn:
-            cursor = conn.execute(
-                "SELECT * FROM files WHERE filename LIKE ?",
-                (f"%{extension}",)
-            )
-            return [dict(row) for row in cursor.fetchall()]
-    
-    def get_files_in_directory(self, directory: str) -> list[dict]:
+
+        # Equality on the indexed extension column: index seek, not
+        # the full-table scan a trailing-wildcard LIKE forces
+        cursor = self._get_conn().execute(
+            "SELECT * FROM files WHERE extension = ?",
+            (extension.lower(),)
+        )
+        yield from cursor
+
+    def get_files_by_extension(self, extension: str) -> list[sqlite3.Row]:
+        """Get files with a specific extension."""
+        return list(self.iter_files_by_extension(extension))
+
+    def iter_files_in_directory(self, directory: str) -> Generator[sqlite3.Row, None, None]:
+        """Yield files within a specific directory, one row at a time."""
+        # Explicit range predicate so the primary-key index serves
+        # the prefix match regardless of LIKE optimization settings
+        cursor = self._get_conn().execute(
+            "SELECT * FROM files WHERE filepath >= ? AND filepath < ?",
+            (directory, directory + "\uffff")
+        )
+        yield from cursor
+
+    def get_files_in_directory(self, directory: str) -> list[sqlite3.Row]:
         """Get files within a specific directory."""
-        with self._connection() as conn:
-            cursor = conn.execute(
-                "SELECT * FROM files WHERE filepath LIKE ?",
-                (f"{directory}%",)
-            )
-            return [dict(row) for row in cursor.fetchall()]
+        return list(self.iter_files_in_directory(directory))
     
+    def query_files(self, filters, limit: int | None = None) -> list[sqlite3.Row]:
+        """
+        Query files with filter predicates pushed down into SQL.
+
+        Applying a QueryFilters after retrieval means loading and
+        serializing rows the caller immediately discards; here each
+        predicate becomes an indexed WHERE clause instead (extension
+        IN, indexed_at range, filepath prefix range). Callers can
+        intersect the returned filepath set with vector-search results
+        rather than post-filtering in Python.
+
+        Args:
+            filters: QueryFilters with optional file_types, date range,
+                and directory
+            limit: Optional cap on returned rows
+
+        Returns:
+            Matching sqlite3.Row rows, most recently indexed first
+        """
+        clauses = []
+        params: list = []
+
+        if filters.file_types:
+            placeholders = ", ".join("?" * len(filters.file_types))
+            clauses.append(f"extension IN ({placeholders})")
+            params.extend(ext.lower() for ext in filters.file_types)
+
+        if filters.date_from:
+            clauses.append("indexed_at >= ?")
+            params.append(int(filters.date_from.timestamp()))
+
+        if filters.date_to:
+            clauses.append("indexed_at < ?")
+            params.append(int(filters.date_to.timestamp()))
+
+        if filters.directory:
+            expanded = os.path.expanduser(filters.directory)
+            clauses.append("filepath >= ? AND filepath < ?")
+            params.extend((expanded, expanded + "\uffff"))
+
+        sql = "SELECT * FROM files"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY indexed_at DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with self._connection() as conn:
+            return conn.execute(sql, params).fetchall()
+
     def get_indexed_filepaths(self) -> set[str]:
         """Get set of all indexed file paths."""
         with self._connection() as conn:
@@ -271,13 +620,15 @@ class SQLiteManifest:
     def get_extension_counts(self) -> dict[str, int]:
         """Get file counts by extension."""
         with self._connection() as conn:
+            # Covering-index scan over idx_files_ext — no per-row
+            # INSTR/SUBSTR string slicing and the table is never touched
+            # (a NULL extension fails != '' too, so one predicate covers
+            # both empty and missing)
             cursor = conn.execute("""
-                SELECT 
-                    LOWER(SUBSTR(filename, INSTR(filename, '.'))) as ext,
-                    COUNT(*) as count
-                FROM files 
-                WHERE filename LIKE '%.%'
-                GROUP BY ext
+                SELECT extension as ext, COUNT(*) as count
+                FROM files
+                WHERE extension != ''
+                GROUP BY extension
                 ORDER BY count DESC
             """)
             return {row["ext"]: row["count"] for row in cursor.fetchall()}
@@ -300,30 +651,88 @@ class SQLiteManifest:
         """Set a metadata value."""
         with self._connection() as conn:
             conn.execute(
-                "INSERT OR REPLACE INTO metadata (key, value) VALUES (?, ?)",
+                """INSERT INTO metadata (key, value) VALUES (?, ?)
+                   ON CONFLICT(key) DO UPDATE SET value = excluded.value""",
                 (key, value)
             )
     
     def mark_full_scan_complete(self) -> None:
         """Record that a full scan was completed."""
         self.set_metadata("last_full_scan", datetime.now().isoformat())
+        # Let SQLite refresh its query-planner statistics after bulk writes
+        with self._connection() as conn:
+            conn.execute("PRAGMA optimize")
     
     # ========================================================================
     # Utilities
     # ========================================================================
     
     @staticmethod
-    def compute_file_hash(filepath: Path) -> str:
-        """Compute MD5 hash of file contents."""
-        hasher = hashlib.md5()
+    def compute_file_hash(filepath: Path, algorithm: str | None = None) -> str:
+        """
+        Compute a content hash, prefixed with the algorithm name.
+
+        Prefers BLAKE3 (SIMD, multi-GB/s) and falls back to BLAKE2b
+        from the stdlib. The "b3:"/"b2:"/"md5:" prefix keeps old
+        unprefixed MD5 hashes comparable: needs_indexing re-hashes with
+        whatever algorithm produced the stored value instead of
+        invalidating the whole manifest.
+        """
+        if algorithm is None:
+            algorithm = "b3" if _blake3 is not None else "b2"
+
         try:
-            with open(filepath, "rb") as f:
-                for chunk in iter(lambda: f.read(65536), b""):
-                    hasher.update(chunk)
-            return hasher.hexdigest()
+            if algorithm == "b3" and _blake3 is not None:
+                hasher = _blake3(max_threads=_blake3.AUTO)
+                hasher.update_mmap(str(filepath))
+                return "b3:" + hasher.hexdigest()
+
+            name = "blake2b" if algorithm == "b2" else "md5"
+            if hasattr(hashlib, "file_digest"):
+                # 3.11+: C-level loop reading into one reusable buffer,
+                # no per-chunk bytes allocation
+                with open(filepath, "rb", buffering=0) as f:
+                    digest = hashlib.file_digest(f, name)
+            else:
+                digest = hashlib.new(name)
+                with open(filepath, "rb") as f:
+                    for chunk in iter(lambda: f.read(65536), b""):
+                        digest.update(chunk)
+            return f"{algorithm}:{digest.hexdigest()}"
         except Exception:
             return ""
-    
+
+    @staticmethod
+    def compute_file_hashes_parallel(
+        paths: list[Path],
+        max_workers: int | None = None,
+    ) -> dict[str, str]:
+        """
+        Hash many files concurrently across worker processes.
+
+        Hashing a full scan's worth of files is embarrassingly
+        parallel; ProcessPoolExecutor sidesteps the GIL so wall-clock
+        time divides by roughly min(cores, disk parallelism).
+
+        Args:
+            paths: Files to hash
+            max_workers: Worker count (defaults to cpu_count)
+
+        Returns:
+            Mapping of str(path) to prefixed hash
+        """
+        if len(paths) <= 1:
+            return {str(p): SQLiteManifest.compute_file_hash(p) for p in paths}
+
+        workers = max_workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            hashes = pool.map(
+                SQLiteManifest.compute_file_hash,
+                paths,
+                chunksize=max(1, len(paths) // (workers * 4)),
+            )
+        return {str(p): h for p, h in zip(paths, hashes)}
+
     def vacuum(self) -> None:
         """Compact the database file."""
         with self._connection() as conn:
@@ -331,50 +740,126 @@ class SQLiteManifest:
     
     def export_to_json(self) -> dict:
         """Export manifest to JSON-compatible dict."""
-        files = self.get_all_files()
         return {
             "files": {
                 f["filepath"]: {
                     "hash": f["file_hash"],
                     "mtime": f["mtime"],
                     "size": f["size"],
-                    "indexed_at": f["indexed_at"],
+                    "indexed_at": _epoch_to_iso(f["indexed_at"]),
                     "chunk_count": f["chunk_count"],
                 }
-                for f in files
+                for f in self.iter_all_files()
             },
             "last_full_scan": self.get_metadata("last_full_scan"),
         }
+
+    def export_to_json_file(self, path: Path) -> int:
+        """
+        Stream the manifest to a JSON file. Returns rows written.
+
+        Produces the same document as export_to_json but writes each
+        row as it comes off the cursor, so a large manifest is never
+        held in memory twice (once as dicts, once as the dump).
+        """
+        import json
+
+        count = 0
+        with open(path, "w") as f:
+            f.write('{"files": {')
+            for row in self.iter_all_files():
+                if count:
+                    f.write(", ")
+                info = {
+                    "hash": row["file_hash"],
+                    "mtime": row["mtime"],
+                    "size": row["size"],
+                    "indexed_at": _epoch_to_iso(row["indexed_at"]),
+                    "chunk_count": row["chunk_count"],
+                }
+                f.write(f"{json.dumps(row['filepath'])}: {json.dumps(info)}")
+                count += 1
+            f.write('}, "last_full_scan": ')
+            f.write(json.dumps(self.get_metadata("last_full_scan")))
+            f.write("}")
+        return count
     
+    IMPORT_BATCH_SIZE = 10_000
+
+    _IMPORT_UPSERT_SQL = """
+        INSERT INTO files
+        (filepath, filename, file_hash, mtime, mtime_ns, size, indexed_at, chunk_count, extension)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(filepath) DO UPDATE SET
+            filename = excluded.filename,
+            file_hash = excluded.file_hash,
+            mtime = excluded.mtime,
+            mtime_ns = excluded.mtime_ns,
+            size = excluded.size,
+            indexed_at = excluded.indexed_at,
+            chunk_count = excluded.chunk_count,
+            extension = excluded.extension
+    """
+
     def import_from_json(self, data: dict) -> int:
         """Import from JSON manifest. Returns count imported."""
         files = data.get("files", {})
         count = 0
-        
-        with self._connection() as conn:
-            for filepath, info in files.items():
-                conn.execute("""
-                    INSERT OR REPLACE INTO files 
-                    (filepath, filename, file_hash, mtime, size, indexed_at, chunk_count)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    filepath,
-                    Path(filepath).name,
-                    info.get("hash"),
-                    info.get("mtime"),
-                    info.get("size"),
-                    info.get("indexed_at"),
-                    info.get("chunk_count", 0),
-                ))
-                count += 1
-            
-            # Import metadata
-            if data.get("last_full_scan"):
-                conn.execute(
-                    "INSERT OR REPLACE INTO metadata (key, value) VALUES (?, ?)",
-                    ("last_full_scan", data["last_full_scan"])
-                )
-        
+
+        # Bulk load: rows go through executemany in large batches
+        # instead of one execute (and one cache invalidation) each,
+        # and fsyncs are deferred for the duration — the import is
+        # all-or-nothing anyway
+        conn = self._get_conn()
+        conn.execute("PRAGMA synchronous=OFF")
+        # Classic ETL move for big imports: drop the secondary indexes
+        # so each row costs one B-tree insert instead of four, then
+        # rebuild them once from the finished table
+        rebuild_indexes = len(files) >= self.IMPORT_BATCH_SIZE
+        if rebuild_indexes:
+            conn.executescript("""
+                DROP INDEX IF EXISTS idx_files_mtime;
+                DROP INDEX IF EXISTS idx_files_indexed_at;
+                DROP INDEX IF EXISTS idx_files_ext;
+            """)
+        try:
+            with self._connection() as txn:
+                batch = []
+                for filepath, info in files.items():
+                    path = Path(filepath)
+                    batch.append((
+                        filepath,
+                        path.name,
+                        info.get("hash"),
+                        info.get("mtime"),
+                        info.get("mtime_ns"),
+                        info.get("size"),
+                        _to_epoch(info.get("indexed_at")),
+                        info.get("chunk_count", 0),
+                        path.suffix.lower(),
+                    ))
+                    if len(batch) >= self.IMPORT_BATCH_SIZE:
+                        txn.executemany(self._IMPORT_UPSERT_SQL, batch)
+                        count += len(batch)
+                        batch.clear()
+                if batch:
+                    txn.executemany(self._IMPORT_UPSERT_SQL, batch)
+                    count += len(batch)
+
+                # Import metadata
+                if data.get("last_full_scan"):
+                    txn.execute(
+                        """INSERT INTO metadata (key, value) VALUES (?, ?)
+                           ON CONFLICT(key) DO UPDATE SET value = excluded.value""",
+                        ("last_full_scan", data["last_full_scan"])
+                    )
+        finally:
+            if rebuild_indexes:
+                conn.executescript(_FILES_INDEXES_SQL)
+            conn.execute("PRAGMA synchronous=NORMAL")
+
+        with self._cache_lock:
+            self._file_cache.clear()
         return count
 
 
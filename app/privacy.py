@@ -16,12 +16,34 @@ import shutil
 from datetime import datetime
 from pathlib import Path
 
+try:
+    import ijson
+except ImportError:  # stream parsing degrades to a full json.load
+    ijson = None
+
 from app.config import DATA_DIR, INDEX_PATH, ensure_data_dir
+from app.manifest_db import SQLiteManifest
 from app.security import get_audit_logger
 
 logger = logging.getLogger("rag.privacy")
 
 
+def _iter_manifest_files(manifest_path: Path):
+    """
+    Yield (filepath, info) pairs from a JSON manifest.
+
+    With ijson installed the entries stream straight off the file, so
+    a 100k-file manifest never has to exist in memory as one dict;
+    otherwise this degrades to json.load.
+    """
+    if ijson is not None:
+        with open(manifest_path, "rb") as f:
+            yield from ijson.kvitems(f, "files")
+        return
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        yield from json.load(f).get("files", {}).items()
+
+
 class PrivacyManager:
     """
     Manages user privacy controls for the RAG system.
@@ -36,6 +58,39 @@ class PrivacyManager:
     def __init__(self, data_dir: Path | None = None):
         self.data_dir = data_dir or DATA_DIR
         self.audit = get_audit_logger(self.data_dir)
+        self._manifest: SQLiteManifest | None = None
+
+    def _get_manifest(self) -> SQLiteManifest | None:
+        """
+        The SQLite manifest, if one exists.
+
+        Queries go to SQLite when the watcher has migrated (indexed
+        lookups instead of parsing the whole JSON file); installs that
+        still have only scan_manifest.json fall back to the JSON path.
+        """
+        db_path = self.data_dir / "manifest.db"
+        if not db_path.exists():
+            return None
+        if self._manifest is None:
+            self._manifest = SQLiteManifest(db_path)
+        return self._manifest
+
+    def _tombstones_path(self) -> Path:
+        return self.data_dir / "scan_manifest.tombstones"
+
+    def _load_tombstones(self) -> set[str]:
+        """Paths deleted from the JSON manifest but not yet compacted."""
+        path = self._tombstones_path()
+        if not path.exists():
+            return set()
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return {
+                    json.loads(line)["path"] for line in f if line.strip()
+                }
+        except Exception as e:
+            logger.error("Failed to read tombstones: %s", e)
+            return set()
     
     # ========================================================================
     # Data Visibility
@@ -47,17 +102,34 @@ class PrivacyManager:
         
         Returns list of dicts with: filepath, filename, indexed_at, chunk_count
         """
+        manifest = self._get_manifest()
+        if manifest is not None:
+            return [
+                {
+                    "filepath": row["filepath"],
+                    "filename": row["filename"],
+                    "indexed_at": (
+                        datetime.fromtimestamp(row["indexed_at"]).isoformat()
+                        if row["indexed_at"] is not None
+                        else "unknown"
+                    ),
+                    "chunk_count": row["chunk_count"] or 0,
+                    "size_bytes": row["size"] or 0,
+                }
+                for row in manifest.iter_all_files()
+            ]
+
         manifest_path = self.data_dir / "scan_manifest.json"
         
         if not manifest_path.exists():
             return []
         
         try:
-            with open(manifest_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            
+            tombstones = self._load_tombstones()
             files = []
-            for filepath, info in data.get("files", {}).items():
+            for filepath, info in _iter_manifest_files(manifest_path):
+                if filepath in tombstones:
+                    continue
                 files.append({
                     "filepath": filepath,
                     "filename": Path(filepath).name,
@@ -76,6 +148,9 @@ class PrivacyManager:
     
     def get_indexed_file_count(self) -> int:
         """Get count of indexed files."""
+        manifest = self._get_manifest()
+        if manifest is not None:
+            return manifest.get_stats()["total_files"]
         return len(self.list_indexed_files())
     
     def get_storage_stats(self) -> dict:
@@ -99,16 +174,21 @@ class PrivacyManager:
         }
         
         # Count files and chunks from manifest
+        manifest = self._get_manifest()
         manifest_path = self.data_dir / "scan_manifest.json"
-        if manifest_path.exists():
+        if manifest is not None:
+            db_stats = manifest.get_stats()
+            stats["total_files"] = db_stats["total_files"]
+            stats["total_chunks"] = db_stats["total_chunks"]
+            stats["manifest_size_kb"] = (self.data_dir / "manifest.db").stat().st_size / 1024
+        elif manifest_path.exists():
             try:
-                with open(manifest_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                files = data.get("files", {})
-                stats["total_files"] = len(files)
-                stats["total_chunks"] = sum(
-                    f.get("chunk_count", 0) for f in files.values()
-                )
+                tombstones = self._load_tombstones()
+                for filepath, info in _iter_manifest_files(manifest_path):
+                    if filepath in tombstones:
+                        continue
+                    stats["total_files"] += 1
+                    stats["total_chunks"] += info.get("chunk_count", 0)
                 stats["manifest_size_kb"] = manifest_path.stat().st_size / 1024
             except Exception:
                 pass
@@ -151,15 +231,19 @@ class PrivacyManager:
         
         Shows exactly what files have been indexed.
         """
+        manifest = self._get_manifest()
         manifest_path = self.data_dir / "scan_manifest.json"
         
-        if not manifest_path.exists():
+        if manifest is None and not manifest_path.exists():
             logger.warning("No manifest to export")
             return False
         
         try:
-            with open(manifest_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            if manifest is not None:
+                data = manifest.export_to_json()
+            else:
+                with open(manifest_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
             
             # Make it human-readable
             export_data = {
@@ -170,7 +254,10 @@ class PrivacyManager:
                 "files": []
             }
             
+            tombstones = self._load_tombstones() if manifest is None else set()
             for filepath, info in data.get("files", {}).items():
+                if filepath in tombstones:
+                    continue
                 export_data["files"].append({
                     "path": filepath,
                     "name": Path(filepath).name,
@@ -278,6 +365,15 @@ class PrivacyManager:
         
         Note: Vectors remain in FAISS until full rebuild.
         """
+        manifest = self._get_manifest()
+        if manifest is not None:
+            if not manifest.file_exists(filepath):
+                return False
+            manifest.mark_deleted(Path(filepath))
+            self.audit.log_file_deleted(filepath)
+            logger.info("Removed from index: %s", filepath)
+            return True
+
         manifest_path = self.data_dir / "scan_manifest.json"
         
         if not manifest_path.exists():
@@ -286,18 +382,30 @@ class PrivacyManager:
         try:
             with open(manifest_path, "r", encoding="utf-8") as f:
                 data = json.load(f)
-            
-            if filepath in data.get("files", {}):
-                del data["files"][filepath]
-                
+
+            files = data.get("files", {})
+            tombstones = self._load_tombstones()
+            if filepath not in files or filepath in tombstones:
+                return False
+
+            # Append-only tombstone: a delete is one line of I/O, not
+            # a rewrite of the whole manifest
+            with open(self._tombstones_path(), "a", encoding="utf-8") as f:
+                f.write(json.dumps({"op": "del", "path": filepath}) + "\n")
+            tombstones.add(filepath)
+
+            # Compact once tombstones reach 10% of the manifest so the
+            # log can't grow unbounded (small manifests compact at once)
+            if len(tombstones) * 10 >= len(files):
+                for dead in tombstones:
+                    files.pop(dead, None)
                 with open(manifest_path, "w", encoding="utf-8") as f:
                     json.dump(data, f, indent=2)
-                
-                self.audit.log_file_deleted(filepath)
-                logger.info("Removed from index: %s", filepath)
-                return True
-            
-            return False
+                self._tombstones_path().unlink(missing_ok=True)
+
+            self.audit.log_file_deleted(filepath)
+            logger.info("Removed from index: %s", filepath)
+            return True
         
         except Exception as e:
             logger.error("Failed to delete file from index: %s", e)
@@ -340,6 +448,7 @@ class PrivacyManager:
         try:
             if manifest_path.exists():
                 manifest_path.unlink()
+                self._tombstones_path().unlink(missing_ok=True)
                 self.audit.log_data_deletion("manifest")
                 logger.info("Deleted manifest")
                 return True
@@ -394,11 +503,14 @@ class PrivacyManager:
                     path.unlink()
                     deleted_items.append(path.name)
             
-            # Delete manifest
+            # Delete manifest (and any pending tombstones)
             manifest_path = self.data_dir / "scan_manifest.json"
             if manifest_path.exists():
                 manifest_path.unlink()
                 deleted_items.append("scan_manifest.json")
+            if self._tombstones_path().exists():
+                self._tombstones_path().unlink()
+                deleted_items.append("scan_manifest.tombstones")
             
             # Delete index manifest (old format)
             old_manifest = self.data_dir / "index_manifest.json"
@@ -406,6 +518,16 @@ class PrivacyManager:
                 old_manifest.unlink()
                 deleted_items.append("index_manifest.json")
             
+            # Delete SQLite manifest (and its WAL sidecars)
+            if self._manifest is not None:
+                self._manifest.close()
+                self._manifest = None
+            for name in ["manifest.db", "manifest.db-wal", "manifest.db-shm"]:
+                db_file = self.data_dir / name
+                if db_file.exists():
+                    db_file.unlink()
+                    deleted_items.append(name)
+            
             # Delete audit log
             audit_path = self.data_dir / "audit.log"
             if audit_path.exists():
@@ -10,11 +10,14 @@ Extracts filters and the actual search query.
 """
 from __future__ import annotations
 
+import os
 import re
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from typing import Any
 
+import numpy as np
+
 
 @dataclass
 class QueryFilters:
@@ -92,38 +95,40 @@ FILE_TYPE_PATTERNS = {
 # Date Patterns
 # ============================================================================
 
-# Relative time patterns
+# Relative time patterns. Handlers take the current time so each
+# parse_query call reads the clock exactly once; handlers that need the
+# match object take it as a second argument.
 RELATIVE_DATE_PATTERNS = {
-    r"\btoday\b": lambda: (datetime.now().replace(hour=0, minute=0, second=0), None),
-    r"\byesterday\b": lambda: (
-        (datetime.now() - timedelta(days=1)).replace(hour=0, minute=0, second=0),
-        datetime.now().replace(hour=0, minute=0, second=0)
+    r"\btoday\b": lambda now: (now.replace(hour=0, minute=0, second=0), None),
+    r"\byesterday\b": lambda now: (
+        (now - timedelta(days=1)).replace(hour=0, minute=0, second=0),
+        now.replace(hour=0, minute=0, second=0)
     ),
-    r"\blast\s+week\b": lambda: (datetime.now() - timedelta(weeks=1), None),
-    r"\bthis\s+week\b": lambda: (
-        datetime.now() - timedelta(days=datetime.now().weekday()),
+    r"\blast\s+week\b": lambda now: (now - timedelta(weeks=1), None),
+    r"\bthis\s+week\b": lambda now: (
+        now - timedelta(days=now.weekday()),
         None
     ),
-    r"\blast\s+month\b": lambda: (datetime.now() - timedelta(days=30), None),
-    r"\bthis\s+month\b": lambda: (
-        datetime.now().replace(day=1, hour=0, minute=0, second=0),
+    r"\blast\s+month\b": lambda now: (now - timedelta(days=30), None),
+    r"\bthis\s+month\b": lambda now: (
+        now.replace(day=1, hour=0, minute=0, second=0),
         None
     ),
-    r"\blast\s+year\b": lambda: (datetime.now() - timedelta(days=365), None),
-    r"\bthis\s+year\b": lambda: (
-        datetime.now().replace(month=1, day=1, hour=0, minute=0, second=0),
+    r"\blast\s+year\b": lambda now: (now - timedelta(days=365), None),
+    r"\bthis\s+year\b": lambda now: (
+        now.replace(month=1, day=1, hour=0, minute=0, second=0),
         None
     ),
-    r"\blast\s+(\d+)\s+days?\b": lambda m: (
-        datetime.now() - timedelta(days=int(m.group(1))),
+    r"\blast\s+(?P<n_days>\d+)\s+days?\b": lambda now, m: (
+        now - timedelta(days=int(m.group("n_days"))),
         None
     ),
-    r"\blast\s+(\d+)\s+weeks?\b": lambda m: (
-        datetime.now() - timedelta(weeks=int(m.group(1))),
+    r"\blast\s+(?P<n_weeks>\d+)\s+weeks?\b": lambda now, m: (
+        now - timedelta(weeks=int(m.group("n_weeks"))),
         None
     ),
-    r"\blast\s+(\d+)\s+months?\b": lambda m: (
-        datetime.now() - timedelta(days=int(m.group(1)) * 30),
+    r"\blast\s+(?P<n_months>\d+)\s+months?\b": lambda now, m: (
+        now - timedelta(days=int(m.group("n_months")) * 30),
         None
     ),
 }
@@ -159,6 +164,61 @@ FILTER_PHRASES = [
 ]
 
 
+# ============================================================================
+# Compiled Pattern Tables
+# ============================================================================
+
+# One alternation per category, compiled once at import: the regex
+# engine walks the query a single time instead of once per pattern.
+
+_FILE_TYPE_RE = re.compile(
+    "|".join(f"(?P<ft{i}>{pattern})" for i, pattern in enumerate(FILE_TYPE_PATTERNS)),
+    re.IGNORECASE,
+)
+_FILE_TYPE_EXTENSIONS = {
+    f"ft{i}": extensions for i, extensions in enumerate(FILE_TYPE_PATTERNS.values())
+}
+
+_RELATIVE_DATE_RE = re.compile(
+    "|".join(f"(?P<rd{i}>{pattern})" for i, pattern in enumerate(RELATIVE_DATE_PATTERNS)),
+    re.IGNORECASE,
+)
+# Handler arity is resolved once here instead of via inspect.signature
+# on every match: (handler, wants_match_object)
+_RELATIVE_DATE_HANDLERS = {
+    f"rd{i}": (handler, handler.__code__.co_argcount > 1)
+    for i, handler in enumerate(RELATIVE_DATE_PATTERNS.values())
+}
+_RELATIVE_DATE_SUBS = {
+    f"rd{i}": re.compile(pattern, re.IGNORECASE)
+    for i, pattern in enumerate(RELATIVE_DATE_PATTERNS)
+}
+
+_FILTER_PHRASE_RE = re.compile("|".join(FILTER_PHRASES), re.IGNORECASE)
+
+_MONTH_RE = re.compile(
+    r"\b(in|from|during)\s+(january|february|march|april|may|june|july|august|september|october|november|december)(?:\s+(\d{4}))?\b",
+    re.IGNORECASE,
+)
+_YEAR_RE = re.compile(r"\b(?:from|in)\s+(\d{4})\b", re.IGNORECASE)
+_DIRECTORY_RE = re.compile(
+    r"\b(?:in|from)\s+(?:my\s+)?(documents?|desktop|downloads?|pictures?)\b",
+    re.IGNORECASE,
+)
+_WHITESPACE_RE = re.compile(r"\s+")
+_DANGLING_FILTER_RE = re.compile(
+    r"^\s*(from|in|modified|created|during|since)\s*$", re.IGNORECASE
+)
+
+
+def _matched_category(match: re.Match, prefix: str) -> str:
+    """Find which category group of a combined alternation matched."""
+    for name, value in match.groupdict().items():
+        if value is not None and name.startswith(prefix):
+            return name
+    raise ValueError(f"no {prefix} group matched")
+
+
 def parse_query(query: str) -> QueryFilters:
     """
     Parse a natural language query to extract filters.
@@ -176,51 +236,45 @@ def parse_query(query: str) -> QueryFilters:
     """
     original = query
     query_lower = query.lower()
+    now = datetime.now()
     
     file_types: list[str] = []
     date_from: datetime | None = None
     date_to: datetime | None = None
     directory: str | None = None
     
-    # Extract file types
-    for pattern, extensions in FILE_TYPE_PATTERNS.items():
-        if re.search(pattern, query_lower):
-            file_types.extend(extensions)
-            query = re.sub(pattern, "", query, flags=re.IGNORECASE)
-    
-    # Remove duplicates
-    file_types = list(set(file_types))
+    # Extract file types in one pass over the combined alternation
+    def _collect_file_type(match: re.Match) -> str:
+        file_types.extend(_FILE_TYPE_EXTENSIONS[match.lastgroup])
+        return ""
+
+    query = _FILE_TYPE_RE.sub(_collect_file_type, query)
+
+    # Remove duplicates, keeping first-seen order
+    file_types = list(dict.fromkeys(file_types))
     
-    # Extract relative dates
-    for pattern, date_func in RELATIVE_DATE_PATTERNS.items():
-        match = re.search(pattern, query_lower)
-        if match:
-            if callable(date_func):
-                try:
-                    # Check if the function needs the match object
-                    import inspect
-                    sig = inspect.signature(date_func)
-                    if len(sig.parameters) > 0:
-                        result = date_func(match)
-                    else:
-                        result = date_func()
-                    
-                    if isinstance(result, tuple):
-                        date_from, date_to = result
-                    else:
-                        date_from = result
-                except Exception:
-                    pass
-            
-            query = re.sub(pattern, "", query, flags=re.IGNORECASE)
-            break
+    # Extract relative dates (first match wins)
+    match = _RELATIVE_DATE_RE.search(query_lower)
+    if match:
+        category = _matched_category(match, "rd")
+        date_func, wants_match = _RELATIVE_DATE_HANDLERS[category]
+        try:
+            result = date_func(now, match) if wants_match else date_func(now)
+
+            if isinstance(result, tuple):
+                date_from, date_to = result
+            else:
+                date_from = result
+        except Exception:
+            pass
+
+        query = _RELATIVE_DATE_SUBS[category].sub("", query)
     
     # Extract month names with optional year
-    month_pattern = r"\b(in|from|during)\s+(january|february|march|april|may|june|july|august|september|october|november|december)(?:\s+(\d{4}))?\b"
-    match = re.search(month_pattern, query_lower)
+    match = _MONTH_RE.search(query_lower)
     if match and not date_from:
         month_name = match.group(2)
-        year = int(match.group(3)) if match.group(3) else datetime.now().year
+        year = int(match.group(3)) if match.group(3) else now.year
         month = MONTHS.get(month_name, 1)
         
         date_from = datetime(year, month, 1)
@@ -230,20 +284,18 @@ def parse_query(query: str) -> QueryFilters:
         else:
             date_to = datetime(year, month + 1, 1)
         
-        query = re.sub(month_pattern, "", query, flags=re.IGNORECASE)
+        query = _MONTH_RE.sub("", query)
     
     # Extract year
-    year_pattern = r"\b(?:from|in)\s+(\d{4})\b"
-    match = re.search(year_pattern, query_lower)
+    match = _YEAR_RE.search(query_lower)
     if match and not date_from:
         year = int(match.group(1))
         date_from = datetime(year, 1, 1)
         date_to = datetime(year + 1, 1, 1)
-        query = re.sub(year_pattern, "", query, flags=re.IGNORECASE)
+        query = _YEAR_RE.sub("", query)
     
     # Extract directory patterns
-    dir_pattern = r"\b(?:in|from)\s+(?:my\s+)?(documents?|desktop|downloads?|pictures?)\b"
-    match = re.search(dir_pattern, query_lower)
+    match = _DIRECTORY_RE.search(query_lower)
     if match:
         folder = match.group(1).rstrip("s").capitalize()
         if folder == "Document":
@@ -253,13 +305,13 @@ def parse_query(query: str) -> QueryFilters:
         elif folder == "Picture":
             folder = "Pictures"
         directory = f"~/{folder}"
-        query = re.sub(dir_pattern, "", query, flags=re.IGNORECASE)
+        query = _DIRECTORY_RE.sub("", query)
     
     # Clean up the query
-    query = re.sub(r"\s+", " ", query).strip()
+    query = _WHITESPACE_RE.sub(" ", query).strip()
     
     # Remove dangling filter words
-    query = re.sub(r"^\s*(from|in|modified|created|during|since)\s*$", "", query, flags=re.IGNORECASE)
+    query = _DANGLING_FILTER_RE.sub("", query)
     query = query.strip()
     
     return QueryFilters(
@@ -286,46 +338,49 @@ def apply_filters_to_results(
     Returns:
         Filtered results
     """
-    if not filters.has_filters():
+    if not filters.has_filters() or not results:
         return results
-    
-    filtered = []
-    
-    for result in results:
-        # Check file type
-        if filters.file_types:
-            ext = "." + result.get("filename", "").split(".")[-1].lower()
-            if ext not in filters.file_types:
-                continue
-        
-        # Check date range
-        if filters.date_from or filters.date_to:
-            indexed_at = result.get("indexed_at")
-            if indexed_at:
-                try:
-                    if isinstance(indexed_at, str):
-                        doc_date = datetime.fromisoformat(indexed_at.replace("Z", "+00:00"))
-                    else:
-                        doc_date = indexed_at
-                    
-                    if filters.date_from and doc_date < filters.date_from:
-                        continue
-                    if filters.date_to and doc_date >= filters.date_to:
-                        continue
-                except Exception:
-                    pass
-        
-        # Check directory
-        if filters.directory:
-            import os
-            expanded = os.path.expanduser(filters.directory)
-            filepath = result.get("filepath", "")
-            if not filepath.startswith(expanded):
-                continue
-        
-        filtered.append(result)
-    
-    return filtered
+
+    # Build one boolean mask with vectorized column ops instead of
+    # looping split/fromisoformat/startswith over every result dict
+    mask = np.ones(len(results), dtype=bool)
+
+    if filters.file_types:
+        filenames = np.array([r.get("filename", "") for r in results])
+        exts = np.char.add(".", np.char.lower(np.char.rpartition(filenames, ".")[:, 2]))
+        mask &= np.isin(exts, filters.file_types)
+
+    if filters.date_from or filters.date_to:
+        dates = np.array(
+            [_to_datetime64(r.get("indexed_at")) for r in results],
+            dtype="datetime64[us]",
+        )
+        # Rows without a parseable date pass through, as before
+        valid = ~np.isnat(dates)
+        if filters.date_from:
+            mask &= ~valid | (dates >= np.datetime64(filters.date_from))
+        if filters.date_to:
+            mask &= ~valid | (dates < np.datetime64(filters.date_to))
+
+    if filters.directory:
+        expanded = os.path.expanduser(filters.directory)
+        filepaths = np.array([r.get("filepath", "") for r in results])
+        mask &= np.char.startswith(filepaths, expanded)
+
+    return [results[i] for i in np.flatnonzero(mask)]
+
+
+def _to_datetime64(indexed_at) -> np.datetime64:
+    """Coerce an indexed_at value to naive datetime64, or NaT."""
+    if isinstance(indexed_at, datetime):
+        return np.datetime64(indexed_at.replace(tzinfo=None))
+    if indexed_at:
+        try:
+            parsed = datetime.fromisoformat(str(indexed_at).replace("Z", "+00:00"))
+            return np.datetime64(parsed.replace(tzinfo=None))
+        except ValueError:
+            pass
+    return np.datetime64("NaT")
 
 
 def format_filters_description(filters: QueryFilters) -> str:
@@ -16,14 +16,22 @@ Design principles:
 """
 from __future__ import annotations
 
+import hashlib
 import logging
 import re
 from dataclasses import dataclass
 from enum import Enum
 from typing import Iterable
 
+import numpy as np
+
 # LLM integration for intelligent extraction
-from app.llm import extract_answer_from_chunk as llm_extract, compress_answer as llm_compress, is_available as llm_available
+from app.llm import (
+    compress_answer as llm_compress,
+    extract_answer_from_chunk as llm_extract,
+    extract_answers_batch as llm_extract_batch,
+    is_available as llm_available,
+)
 
 logger = logging.getLogger("rag")
 
@@ -32,33 +40,120 @@ logger = logging.getLogger("rag")
 # TEXT UTILITIES
 # =============================================================================
 
+# Compiled once at import: these utilities run on every chunk and
+# every candidate sentence, where pattern-cache lookups on such short
+# strings are measurable overhead
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+")
+_WORD_RE = re.compile(r"\w+")
+_PUNCT_SPACE_RE = re.compile(r"\s+([,.;:!?])")
+_HYPHEN_BREAK_RE = re.compile(r"(\w)-\s+(\w)")
+_SPACED_LETTERS_RE = re.compile(r"\b(?:[A-Za-z]\s+){2,}[A-Za-z]\b")
+# Necessary-condition superset of the three artifact patterns above:
+# one scan decides whether clean text (the common case) can skip all
+# three substitution passes
+_PDF_ARTIFACT_HINT_RE = re.compile(r"-\s|\s[,.;:!?]|(?:[A-Za-z]\s+){2}[A-Za-z]")
+
+
 def _sentences(text: str) -> Iterable[str]:
     """Split text into sentences."""
-    for sentence in re.split(r"(?<=[.!?])\s+", text.strip()):
+    for sentence in _SENTENCE_SPLIT_RE.split(text.strip()):
         if sentence:
             yield sentence
 
 
 def _tokenize(text: str) -> set[str]:
     """Tokenize text into lowercase words (3+ chars)."""
-    return {t for t in re.findall(r"\w+", text.lower()) if len(t) > 2}
+    return {t for t in _WORD_RE.findall(text.lower()) if len(t) > 2}
 
 
 def normalize_whitespace(text: str) -> str:
     """Normalize whitespace and punctuation spacing."""
-    text = text.replace("\n", " ")
-    text = re.sub(r"\s+", " ", text)
-    text = re.sub(r"\s+([,.;:!?])", r"\1", text)
-    return text.strip()
+    # split()/join collapses any whitespace run in one C pass (and
+    # strips the ends), so only the punctuation fix still needs a
+    # regex — and by then every run is a single space
+    text = " ".join(text.split())
+    return _PUNCT_SPACE_RE.sub(r"\1", text)
+
+
+def _join_spaced_letters(match: re.Match[str]) -> str:
+    return match.group(0).replace(" ", "")
+
+
+# Long enough that the byte-mask pass below beats regex backtracking;
+# short strings stay on the regex, whose fixed cost is lower
+_SPACED_LETTERS_FAST_MIN = 512
+
+
+def _collapse_spaced_letters_fast(text: str) -> str | None:
+    """Collapse spaced single letters with vectorized byte masks.
+
+    OCR-heavy pages arrive as kilobytes of "R E P O R T"-style runs,
+    and the backtracking regex revisits every letter of every run.
+    This pass classifies all bytes at once and drops the inner spaces
+    of qualifying runs in one fancy-indexing step, byte-parallel in
+    NumPy's C loops.
+
+    Only handles the layout it can prove equivalent to the regex:
+    ASCII text whose whitespace is exclusively single spaces. Returns
+    None for anything else (or short inputs) so the caller falls back
+    to _SPACED_LETTERS_RE.
+    """
+    if len(text) < _SPACED_LETTERS_FAST_MIN:
+        return None
+    try:
+        raw = text.encode("ascii")
+    except UnicodeEncodeError:
+        return None
+
+    b = np.frombuffer(raw, dtype=np.uint8)
+    space = b == 0x20
+    # Tabs/newlines or runs of spaces mean separators wider than one
+    # byte, which this fixed-stride pass doesn't model
+    if ((b >= 9) & (b <= 13)).any() or (space[:-1] & space[1:]).any():
+        return None
+
+    lower = b | 0x20
+    letter = (lower >= 0x61) & (lower <= 0x7A)
+    word = letter | ((b >= 0x30) & (b <= 0x39)) | (b == 0x5F)
+
+    # A single letter has no word character on either side — the \b
+    # conditions of the regex, holding at every letter of a run
+    n = len(b)
+    single = letter.copy()
+    single[1:] &= ~word[:-1]
+    single[:-1] &= ~word[1:]
+
+    # link[i]: positions i and i+2 are single letters joined by a
+    # space; a run of k letters is a chain of k-1 links two apart
+    link = np.zeros(n, dtype=bool)
+    if n >= 3:
+        link[:-2] = single[:-2] & space[1:-1] & single[2:]
+    # The regex wants three or more letters, i.e. at least two
+    # consecutive links; a link qualifies if it has a neighbor
+    neighbor = np.zeros(n, dtype=bool)
+    neighbor[:-2] = link[2:]
+    neighbor[2:] |= link[:-2]
+    qualified = link & neighbor
+    if not qualified.any():
+        return text
+
+    # Each qualifying link owns the space between its letters
+    keep = np.ones(n, dtype=bool)
+    keep[1:] = ~qualified[:-1]
+    return b[keep].tobytes().decode("ascii")
 
 
 def fix_pdf_spacing(text: str) -> str:
     """Fix common PDF extraction artifacts."""
-    text = re.sub(r"(\w)-\s+(\w)", r"\1\2", text)
-    def _join_spaced_letters(match: re.Match[str]) -> str:
-        return match.group(0).replace(" ", "")
-    text = re.sub(r"\b(?:[A-Za-z]\s+){2,}[A-Za-z]\b", _join_spaced_letters, text)
-    text = re.sub(r"\s+([,.;:!?])", r"\1", text)
+    if not _PDF_ARTIFACT_HINT_RE.search(text):
+        return text
+    text = _HYPHEN_BREAK_RE.sub(r"\1\2", text)
+    collapsed = _collapse_spaced_letters_fast(text)
+    if collapsed is None:
+        text = _SPACED_LETTERS_RE.sub(_join_spaced_letters, text)
+    else:
+        text = collapsed
+    text = _PUNCT_SPACE_RE.sub(r"\1", text)
     return text
 
 
@@ -160,18 +255,33 @@ def _propose_answer_regex_fallback(query: str, chunk: dict, text: str) -> Answer
 # REGEX FALLBACK HELPERS
 # =============================================================================
 
-NUMBER_PATTERN = re.compile(r"\$\s*\d[\d,]*(?:\.\d{2})?|\d[\d,]+(?:\.\d{2})?")
-DATE_PATTERN = re.compile(
+# The entity patterns below are backtracking-free by construction, so
+# they compile unchanged under google-re2's linear-time DFA engine —
+# worth it on the fallback path, which scans every sentence of every
+# chunk. The sentence/artifact patterns above stay on stdlib re: they
+# use lookbehind, which RE2 does not support.
+try:
+    import re2 as _entity_re
+except ImportError:  # pragma: no cover - optional speedup
+    _entity_re = re
+
+NUMBER_PATTERN = _entity_re.compile(r"\$\s*\d[\d,]*(?:\.\d{2})?|\d[\d,]+(?:\.\d{2})?")
+DATE_PATTERN = _entity_re.compile(
     r"\b(?:\d{1,2}[/-]\d{1,2}[/-]\d{2,4}|"
     r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?\s+\d{1,2},?\s*\d{4})\b",
-    re.IGNORECASE,
+    _entity_re.IGNORECASE,
 )
-NAME_PATTERN = re.compile(r"\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)+\b")
-ORG_PATTERN = re.compile(
+NAME_PATTERN = _entity_re.compile(r"\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)+\b")
+ORG_PATTERN = _entity_re.compile(
     r"\b(?:[A-Z][A-Za-z&]*(?:\s+[A-Z][A-Za-z&]*)*"
     r"(?:\s+(?:Inc|LLC|Corp|Company|Co|Ltd|University|College|Hospital|Bank|Health))\.?)\b"
 )
-LOCATION_PATTERN = re.compile(r"\b(?:in|at|from|to)\s+([A-Z][a-z]+(?:,?\s+[A-Z][a-z]+)*)")
+LOCATION_PATTERN = _entity_re.compile(r"\b(?:in|at|from|to)\s+([A-Z][a-z]+(?:,?\s+[A-Z][a-z]+)*)")
+
+DIRECT_STATEMENT_PATTERN = _entity_re.compile(
+    r"\b(is|are|was|were|will be)\s+(a|an|the|\$|\d)", _entity_re.IGNORECASE
+)
+COPULA_PATTERN = _entity_re.compile(r"\b(is|are|was|means|refers to)\b", _entity_re.IGNORECASE)
 
 BOILERPLATE_TERMS = {
     "dear", "sincerely", "regards", "confidential", "page",
@@ -201,7 +311,7 @@ def _score_sentence_for_extraction(sentence: str, query_terms: set[str], questio
     word_count = len(sentence.split())
     length_bonus = 0.15 if 4 <= word_count <= 20 else 0.05
     
-    direct_bonus = 0.15 if re.search(r"\b(is|are|was|were|will be)\s+(a|an|the|\$|\d)", sentence, re.I) else 0.0
+    direct_bonus = 0.15 if DIRECT_STATEMENT_PATTERN.search(sentence) else 0.0
     
     return overlap * 0.5 + type_bonus + length_bonus + direct_bonus
 
@@ -229,7 +339,7 @@ def _extract_minimal_span(sentence: str, query_terms: set[str], question_type: s
             return _window_around_match(sentence, match, 5)
     
     if question_type == "what":
-        copula = re.search(r"\b(is|are|was|means|refers to)\b", sentence, re.I)
+        copula = COPULA_PATTERN.search(sentence)
         if copula:
             tail = sentence[copula.end():].strip()
             if tail:
@@ -318,29 +428,40 @@ def select_best_answer(candidates: list[AnswerCandidate], query: str) -> AnswerC
         return None
     
     query_terms = _tokenize(query)
-    scored: list[tuple[float, AnswerCandidate]] = []
+    n = len(candidates)
     
-    for candidate in candidates:
-        score = candidate.confidence * 0.6
-        
-        answer_terms = _tokenize(candidate.answer)
-        if query_terms:
-            overlap = len(query_terms & answer_terms) / len(query_terms)
-            score += overlap * 0.25
-        
-        word_count = len(candidate.answer.split())
-        if 3 <= word_count <= 18:
-            score += 0.1
-        elif word_count > 30:
-            score -= 0.1
-        
-        if _is_generic_answer(candidate.answer):
-            score -= 0.15
-        
-        scored.append((score, candidate))
+    # Pack the per-candidate features into arrays and score them in
+    # one vectorized expression instead of accumulating per candidate
+    confidence = np.fromiter(
+        (c.confidence for c in candidates), dtype=np.float64, count=n
+    )
+    if query_terms:
+        overlap = np.fromiter(
+            (
+                len(query_terms & _tokenize(c.answer)) / len(query_terms)
+                for c in candidates
+            ),
+            dtype=np.float64,
+            count=n,
+        )
+    else:
+        overlap = np.zeros(n)
+    word_count = np.fromiter(
+        (len(c.answer.split()) for c in candidates), dtype=np.int64, count=n
+    )
+    generic = np.fromiter(
+        (_is_generic_answer(c.answer) for c in candidates), dtype=bool, count=n
+    )
     
-    scored.sort(key=lambda x: x[0], reverse=True)
-    return scored[0][1]
+    scores = (
+        confidence * 0.6
+        + overlap * 0.25
+        + np.where((word_count >= 3) & (word_count <= 18), 0.1, 0.0)
+        - np.where(word_count > 30, 0.1, 0.0)
+        - np.where(generic, 0.15, 0.0)
+    )
+    # argmax keeps the stable-sort tie behavior: first of the best
+    return candidates[int(scores.argmax())]
 
 
 def _is_generic_answer(answer: str) -> bool:
@@ -372,6 +493,90 @@ def compress_answer_if_needed(answer: str, max_words: int = 25) -> str:
     return " ".join(words).rstrip(".,;:") + "."
 
 
+# =============================================================================
+# SEMANTIC ANSWER CACHE
+# =============================================================================
+
+class SemanticAnswerCache:
+    """
+    Answer-level cache for near-duplicate queries.
+
+    Rephrasings of the same question over the same retrieved chunk
+    set land on the same answer, so a hit replaces the whole Stage
+    B-D pipeline with one query embedding and a FAISS lookup. Entries
+    are keyed by (query embedding, chunk-set hash); a lookup only
+    counts as a hit when cosine similarity clears the threshold AND
+    the chunk set is identical.
+
+    The cache stays inert until the embedding model is already
+    resident (it never triggers a model load of its own), so cold
+    paths and unit tests pay nothing.
+    """
+
+    SIMILARITY_THRESHOLD = 0.97
+    MAX_ENTRIES = 256
+
+    def __init__(self) -> None:
+        self._index = None
+        self._keys: list[str] = []
+        self._answers: list[dict] = []
+
+    @staticmethod
+    def _chunk_key(chunks: list[dict]) -> str:
+        joined = "\x00".join(sorted(c.get("filepath", "") for c in chunks))
+        return hashlib.sha256(joined.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _embed(query: str) -> np.ndarray | None:
+        try:
+            from app.embeddings import peek_cached_model
+        except ImportError:
+            return None
+
+        model = peek_cached_model()
+        if model is None:
+            return None
+        vec = model.encode([query], normalize_embeddings=True, convert_to_numpy=True)
+        return np.ascontiguousarray(vec, dtype=np.float32)
+
+    def get(self, query: str, chunks: list[dict]) -> dict | None:
+        """Return a cached answer for a near-duplicate query, or None."""
+        if self._index is None or not self._keys:
+            return None
+        vec = self._embed(query)
+        if vec is None:
+            return None
+        chunk_key = self._chunk_key(chunks)
+        scores, ids = self._index.search(vec, min(8, len(self._keys)))
+        for score, idx in zip(scores[0], ids[0]):
+            if idx == -1 or score < self.SIMILARITY_THRESHOLD:
+                continue
+            if self._keys[idx] == chunk_key:
+                return dict(self._answers[idx])
+        return None
+
+    def put(self, query: str, chunks: list[dict], result: dict) -> None:
+        """Cache an answer under the query embedding and chunk set."""
+        vec = self._embed(query)
+        if vec is None:
+            return
+        import faiss
+
+        if self._index is None:
+            self._index = faiss.IndexFlatIP(vec.shape[1])
+        if len(self._keys) >= self.MAX_ENTRIES:
+            # Small cache: reset wholesale rather than tracking ages
+            self._index.reset()
+            self._keys.clear()
+            self._answers.clear()
+        self._index.add(vec)
+        self._keys.append(self._chunk_key(chunks))
+        self._answers.append(dict(result))
+
+
+_answer_cache = SemanticAnswerCache()
+
+
 # =============================================================================
 # MAIN ENTRY POINT
 # =============================================================================
@@ -389,18 +594,51 @@ def extract_best_answer(query: str, chunks: list[dict]) -> dict:
     if not chunks:
         return _abstain_response("No documents found.")
     
-    # Stage B: Per-chunk extraction
+    cached_answer = _answer_cache.get(query, chunks)
+    if cached_answer is not None:
+        logger.debug("Semantic answer cache hit for query: %s", query)
+        return cached_answer
+    
+    # Stage B: Per-chunk extraction. With the LLM available, all
+    # chunks go out in one batched call — one prefill/round-trip
+    # instead of one per chunk; otherwise fall back to the per-chunk
+    # path (regex extraction, or a single-chunk LLM call)
     candidates: list[AnswerCandidate] = []
+    prepared = []
     for chunk in chunks:
-        candidate = propose_answer_from_chunk(query, chunk)
-        if candidate:
-            candidates.append(candidate)
-            logger.debug(
-                "Candidate from %s (conf=%.2f): %s",
-                candidate.source,
-                candidate.confidence,
-                candidate.answer[:80],
+        text = normalize_whitespace(fix_pdf_spacing(chunk.get("text", "")))
+        if text and len(text.split()) >= 5:
+            prepared.append((chunk, text))
+    
+    if len(prepared) > 1 and llm_available():
+        results = llm_extract_batch(query, [text for _, text in prepared])
+        for (chunk, text), result in zip(prepared, results):
+            answer = result.get("answer", "NONE")
+            confidence = result.get("confidence", 0.0)
+            if answer == "NONE" or not answer or confidence < 0.1:
+                continue
+            candidates.append(
+                AnswerCandidate(
+                    answer=answer,
+                    confidence=confidence,
+                    source=chunk.get("filename", ""),
+                    filepath=chunk.get("filepath", ""),
+                    chunk_text=text,
+                )
             )
+    else:
+        for chunk in chunks:
+            candidate = propose_answer_from_chunk(query, chunk)
+            if candidate:
+                candidates.append(candidate)
+    
+    for candidate in candidates:
+        logger.debug(
+            "Candidate from %s (conf=%.2f): %s",
+            candidate.source,
+            candidate.confidence,
+            candidate.answer[:80],
+        )
     
     # Stage C: Select best
     best = select_best_answer(candidates, query)
@@ -419,7 +657,7 @@ def extract_best_answer(query: str, chunks: list[dict]) -> dict:
     
     logger.debug("Final answer (%s): %s", confidence_level.value, final_answer)
     
-    return {
+    result = {
         "answer": final_answer,
         "confidence": best.confidence,
         "confidence_level": confidence_level,
@@ -427,6 +665,8 @@ def extract_best_answer(query: str, chunks: list[dict]) -> dict:
         "filepath": best.filepath,
         "answerable": True,
     }
+    _answer_cache.put(query, chunks, result)
+    return result
 
 
 def _confidence_level_from_score(score: float) -> EvidenceConfidence:
@@ -27,9 +27,14 @@ class ResearchStore:
 
     @classmethod
     def load_or_create(cls, path: Path, dim: int) -> "ResearchStore":
-        if path.with_suffix(".faiss").exists() and path.with_suffix(".pkl").exists():
+        has_meta = any(
+            path.with_suffix(ext).exists() for ext in (".pkl", ".json", ".feather")
+        )
+        if path.with_suffix(".faiss").exists() and has_meta:
             store = cls(path, dim)
-            store.store = FAISSVectorStore.load(path)
+            # This store appends entries after loading, so read into
+            # memory rather than a read-only mapping
+            store.store = FAISSVectorStore.load(path, use_mmap=False)
             store._keys = {meta.get("key", "") for meta in store.store.metadata}
             return store
 
@@ -9,6 +9,7 @@ from __future__ import annotations
 import hashlib
 import json
 import logging
+import os
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
@@ -185,6 +186,9 @@ class FileScanner:
         Yields ScannedFile objects for each valid file found.
         """
         for scan_dir in self.config.get_scan_directories():
+            if self.config.is_directory_excluded(scan_dir):
+                logger.debug("Skipping excluded directory: %s", scan_dir)
+                continue
             logger.info("Scanning directory: %s", scan_dir)
             yield from self._scan_directory(scan_dir, depth=0)
     
@@ -203,18 +207,20 @@ class FileScanner:
         directory: Path,
         depth: int
     ) -> Generator[ScannedFile, None, None]:
-        """Recursively scan a directory for files."""
+        """Recursively scan a directory for files.
+
+        Walks with os.scandir: DirEntry type checks come from the
+        readdir data the listing already produced, so the common case
+        costs no stat syscall per entry, and exclusion is decided on
+        entry.path strings before any Path is allocated. Callers are
+        responsible for the exclusion check on the root itself.
+        """
         # Check depth limit
         if self.config.max_depth > 0 and depth > self.config.max_depth:
             return
         
-        # Check if directory is excluded
-        if self.config.is_directory_excluded(directory):
-            logger.debug("Skipping excluded directory: %s", directory)
-            return
-        
         try:
-            entries = list(directory.iterdir())
+            entries = os.scandir(directory)
         except PermissionError:
             logger.debug("Permission denied: %s", directory)
             return
@@ -222,27 +228,42 @@ class FileScanner:
             logger.debug("Cannot read directory %s: %s", directory, e)
             return
         
-        for entry in entries:
-            try:
-                # Handle symlinks
-                if entry.is_symlink():
-                    if not self.config.follow_symlinks:
+        with entries:
+            for entry in entries:
+                try:
+                    # Handle symlinks
+                    if entry.is_symlink():
+                        if not self.config.follow_symlinks:
+                            continue
+                        resolved = Path(entry.path).resolve()
+                        if resolved.is_dir():
+                            if self.config.recursive and not self.config.is_directory_excluded(resolved):
+                                yield from self._scan_directory(resolved, depth + 1)
+                        elif resolved.is_file():
+                            scanned = self._check_file(resolved)
+                            if scanned:
+                                yield scanned
                         continue
-                    entry = entry.resolve()
-                
-                if entry.is_dir():
-                    if self.config.recursive:
-                        yield from self._scan_directory(entry, depth + 1)
+                    
+                    # Not a symlink, so the no-follow check reads the
+                    # cached entry type instead of issuing a stat
+                    if entry.is_dir(follow_symlinks=False):
+                        if not self.config.recursive:
+                            continue
+                        if self.config.is_directory_excluded(entry.path):
+                            logger.debug("Skipping excluded directory: %s", entry.path)
+                            continue
+                        yield from self._scan_directory(Path(entry.path), depth + 1)
+                    
+                    elif entry.is_file(follow_symlinks=False):
+                        scanned = self._check_file(Path(entry.path))
+                        if scanned:
+                            yield scanned
                 
-                elif entry.is_file():
-                    scanned = self._check_file(entry)
-                    if scanned:
-                        yield scanned
-            
-            except PermissionError:
-                continue
-            except OSError:
-                continue
+                except PermissionError:
+                    continue
+                except OSError:
+                    continue
     
     def _check_file(self, file_path: Path) -> ScannedFile | None:
         """
@@ -7,8 +7,11 @@ Provides security checks and path resolution.
 from __future__ import annotations
 
 import fnmatch
+import functools
 import logging
 import os
+import re
+import stat
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
@@ -70,6 +73,25 @@ class ScannerConfig:
             self.excluded_directories = self._default_excluded_dirs()
         if not self.excluded_file_patterns:
             self.excluded_file_patterns = self._default_excluded_patterns()
+        self._compile_exclusions()
+    
+    def _compile_exclusions(self) -> None:
+        """Fuse the exclusion globs into single compiled regexes.
+
+        The scanner asks is_directory_excluded/is_file_excluded for
+        every filesystem entry; matching one alternation once is O(L)
+        in the path length instead of one fnmatch call per pattern.
+        """
+        def combine(patterns):
+            return re.compile("|".join(f"(?:{fnmatch.translate(p)})" for p in patterns))
+        
+        self._dir_path_re = combine(self.excluded_directories)
+        self._dir_part_re = combine(
+            p.replace("**/", "") for p in self.excluded_directories
+        )
+        file_patterns = [p.lower() for p in self.excluded_file_patterns]
+        self._file_name_re = combine(file_patterns)
+        self._file_path_re = combine(f"**/{p}" for p in file_patterns)
     
     @staticmethod
     def _default_excluded_dirs() -> list[str]:
@@ -126,39 +148,34 @@ class ScannerConfig:
             "*.so", "*.dylib",
         ]
     
-    def is_directory_excluded(self, dir_path: Path) -> bool:
-        """Check if a directory should be excluded from scanning."""
-        dir_str = str(dir_path)
-        dir_name = dir_path.name
-        
-        for pattern in self.excluded_directories:
-            # Check if pattern matches the full path or just the directory name
-            if fnmatch.fnmatch(dir_str, pattern):
-                return True
-            if fnmatch.fnmatch(dir_name, pattern.replace("**/", "")):
-                return True
-            # Check each component of the path
-            for part in dir_path.parts:
-                if fnmatch.fnmatch(part, pattern.replace("**/", "")):
-                    return True
-        
-        return False
-    
-    def is_file_excluded(self, file_path: Path) -> bool:
+    def is_directory_excluded(self, dir_path: Path | str) -> bool:
+        """Check if a directory should be excluded from scanning.
+
+        Accepts a plain string so traversal loops can pass
+        os.DirEntry.path without allocating a Path per entry.
+        """
+        if isinstance(dir_path, Path):
+            dir_str, name, parts = str(dir_path), dir_path.name, dir_path.parts
+        else:
+            dir_str = dir_path.rstrip(os.sep) or os.sep
+            name = os.path.basename(dir_str)
+            parts = dir_str.split(os.sep)
+        if self._dir_path_re.match(dir_str):
+            return True
+        if self._dir_part_re.match(name):
+            return True
+        # Check each component of the path
+        return any(self._dir_part_re.match(part) for part in parts)
+
+    def is_file_excluded(self, file_path: Path | str) -> bool:
         """Check if a file should be excluded from indexing."""
-        filename = file_path.name
-        file_str = str(file_path).lower()
-        
-        for pattern in self.excluded_file_patterns:
-            pattern_lower = pattern.lower()
-            # Match against filename
-            if fnmatch.fnmatch(filename.lower(), pattern_lower):
-                return True
-            # Match against full path for patterns with path separators
-            if fnmatch.fnmatch(file_str, f"**/{pattern_lower}"):
-                return True
-        
-        return False
+        if isinstance(file_path, Path):
+            path_str, name = str(file_path), file_path.name
+        else:
+            path_str, name = file_path, os.path.basename(file_path)
+        if self._file_name_re.match(name.lower()):
+            return True
+        return bool(self._file_path_re.match(path_str.lower()))
     
     def is_file_size_valid(self, file_path: Path) -> bool:
         """Check if file size is within allowed limits."""
@@ -239,18 +256,35 @@ class ScannerConfig:
             return False
     
     def get_scan_directories(self) -> list[Path]:
-        """Get list of directories to scan, filtered by existence."""
+        """Get list of directories to scan, filtered by existence.
+
+        One os.stat per root instead of the exists()/is_dir() pair,
+        which stats the same path twice.
+        """
         valid_dirs = []
         for dir_path in self.scan_directories:
-            if dir_path.exists() and dir_path.is_dir():
+            try:
+                st = os.stat(dir_path, follow_symlinks=self.follow_symlinks)
+            except OSError:
+                logger.warning("Scan directory does not exist: %s", dir_path)
+                continue
+            if stat.S_ISDIR(st.st_mode):
                 valid_dirs.append(dir_path)
             else:
-                logger.warning("Scan directory does not exist: %s", dir_path)
+                logger.warning("Scan path is not a directory: %s", dir_path)
         return valid_dirs
 
 
+@functools.lru_cache(maxsize=1024)
 def _expand_path(path_str: str) -> Path:
-    """Expand ~ and environment variables in path string."""
+    """Expand ~ and environment variables in path string.
+
+    Cached: scans expand the same configured roots over and over,
+    and expansion costs env lookups plus a resolve() syscall. Note
+    the cache pins the environment as seen on first expansion of a
+    given string; call _expand_path.cache_clear() after changing
+    relevant variables.
+    """
     expanded = os.path.expanduser(os.path.expandvars(path_str))
     return Path(expanded).resolve()
 
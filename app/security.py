@@ -9,6 +9,7 @@ Provides:
 """
 from __future__ import annotations
 
+import atexit
 import base64
 import hashlib
 import json
@@ -20,8 +21,10 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any
 
-from cryptography.fernet import Fernet
+from cryptography.exceptions import InvalidTag
+from cryptography.fernet import Fernet, InvalidToken
 from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 
 logger = logging.getLogger("rag.security")
@@ -168,29 +171,55 @@ class EncryptedStorage:
     """
     Provides encrypted read/write for sensitive data.
     
-    Uses Fernet (AES-128-CBC) symmetric encryption.
+    Uses AES-256-GCM: a single authenticated-encryption pass that
+    hardware-accelerates on modern CPUs, versus Fernet's separate
+    AES-CBC + HMAC passes. Blobs written by earlier versions with
+    Fernet still decrypt transparently.
     """
     
+    NONCE_SIZE = 12  # 96-bit nonce, the recommended size for GCM
+    
     def __init__(self, key_manager: KeyManager):
         self.key_manager = key_manager
+        self._aesgcm_cache: dict[str, AESGCM] = {}
         self._fernet_cache: dict[str, Fernet] = {}
     
+    def _get_aesgcm(self, purpose: str) -> AESGCM:
+        """Get or create AESGCM instance for a purpose."""
+        if purpose not in self._aesgcm_cache:
+            # derive_key returns the urlsafe-base64 form Fernet wants;
+            # AESGCM takes the raw 32 bytes underneath
+            key = base64.urlsafe_b64decode(self.key_manager.derive_key(purpose))
+            self._aesgcm_cache[purpose] = AESGCM(key)
+        return self._aesgcm_cache[purpose]
+    
     def _get_fernet(self, purpose: str) -> Fernet:
-        """Get or create Fernet instance for a purpose."""
+        """Get or create Fernet instance for legacy blobs."""
         if purpose not in self._fernet_cache:
             key = self.key_manager.derive_key(purpose)
             self._fernet_cache[purpose] = Fernet(key)
         return self._fernet_cache[purpose]
     
     def encrypt_data(self, data: bytes, purpose: str = "index") -> bytes:
-        """Encrypt raw bytes."""
-        fernet = self._get_fernet(purpose)
-        return fernet.encrypt(data)
+        """Encrypt raw bytes as nonce || ciphertext || tag."""
+        aesgcm = self._get_aesgcm(purpose)
+        nonce = secrets.token_bytes(self.NONCE_SIZE)
+        return nonce + aesgcm.encrypt(nonce, data, None)
     
     def decrypt_data(self, encrypted: bytes, purpose: str = "index") -> bytes:
-        """Decrypt raw bytes."""
-        fernet = self._get_fernet(purpose)
-        return fernet.decrypt(encrypted)
+        """Decrypt raw bytes, falling back to Fernet for legacy data."""
+        aesgcm = self._get_aesgcm(purpose)
+        try:
+            nonce, ciphertext = encrypted[:self.NONCE_SIZE], encrypted[self.NONCE_SIZE:]
+            return aesgcm.decrypt(nonce, ciphertext, None)
+        except (InvalidTag, ValueError):
+            # Pre-GCM files were written as Fernet tokens
+            try:
+                return self._get_fernet(purpose).decrypt(encrypted)
+            except InvalidToken as exc:
+                raise ValueError(
+                    "Encrypted data is neither AES-GCM nor a legacy Fernet token"
+                ) from exc
     
     def save_encrypted_pickle(
         self,
@@ -250,11 +279,39 @@ class AuditLogger:
     - Configuration changes
     """
     
+    FLUSH_EVERY = 50  # entries buffered before forcing a flush
+    
     def __init__(self, data_dir: Path, encrypted_storage: EncryptedStorage | None = None):
         self.log_path = data_dir / "audit.log"
         self.encrypted_log_path = data_dir / "audit.log.enc"
         self.storage = encrypted_storage
         self._ensure_log_exists()
+        # One persistent append handle instead of open/write/close per
+        # entry; a real ingest logs once per file, so the syscall
+        # churn adds up
+        self._buf = None
+        self._pending = 0
+        atexit.register(self.flush)
+    
+    def _writer(self):
+        """Get the buffered append handle, reopening if needed."""
+        # Reopen if the log was deleted out from under us (privacy
+        # controls remove it by path) so appends recreate the file
+        if self._buf is None or self._buf.closed or not self.log_path.exists():
+            if self._buf is not None and not self._buf.closed:
+                self._buf.close()
+            self._ensure_log_exists()
+            self._buf = open(self.log_path, "a", encoding="utf-8", buffering=65536)
+        return self._buf
+    
+    def flush(self) -> None:
+        """Flush buffered entries to disk."""
+        self._pending = 0
+        if self._buf is not None and not self._buf.closed:
+            try:
+                self._buf.flush()
+            except OSError as e:
+                logger.error("Failed to flush audit log: %s", e)
     
     def _ensure_log_exists(self) -> None:
         """Ensure audit log file exists."""
@@ -285,8 +342,10 @@ class AuditLogger:
         entry = self._format_entry(action, details or {})
         
         try:
-            with open(self.log_path, "a", encoding="utf-8") as f:
-                f.write(entry)
+            self._writer().write(entry)
+            self._pending += 1
+            if self._pending >= self.FLUSH_EVERY:
+                self.flush()
         except Exception as e:
             logger.error("Failed to write audit log: %s", e)
     
@@ -321,6 +380,7 @@ class AuditLogger:
     
     def get_recent_entries(self, count: int = 100) -> list[str]:
         """Get recent audit log entries."""
+        self.flush()
         try:
             with open(self.log_path, "r", encoding="utf-8") as f:
                 lines = f.readlines()
@@ -330,6 +390,7 @@ class AuditLogger:
     
     def get_stats(self) -> dict:
         """Get statistics from audit log."""
+        self.flush()
         try:
             with open(self.log_path, "r", encoding="utf-8") as f:
                 lines = f.readlines()
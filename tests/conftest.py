@@ -15,13 +15,74 @@ ROOT_DIR = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT_DIR))
 
 
+def pytest_configure(config):
+    """Register custom markers."""
+    config.addinivalue_line(
+        "markers",
+        "serial: tests that patch module-level globals (e.g. app.privacy.DATA_DIR) "
+        "and must not run concurrently under pytest-xdist",
+    )
+
+
 @pytest.fixture
 def temp_dir():
-    """Create a temporary directory for test files."""
-    with tempfile.TemporaryDirectory() as tmpdir:
+    """Create a temporary directory for test files.
+
+    Prefers /dev/shm (Linux tmpfs) so index save/load round-trips in
+    tests are memory-backed instead of paying real disk I/O; falls
+    back to the platform default temp location elsewhere.
+    """
+    shm = "/dev/shm"
+    base = shm if os.path.isdir(shm) and os.access(shm, os.W_OK) else None
+    with tempfile.TemporaryDirectory(dir=base) as tmpdir:
         yield Path(tmpdir)
 
 
+@pytest.fixture(scope="module")
+def ingester_factory():
+    """Shared DocumentIngester instances, keyed by docs directory.
+
+    The ingester is stateless apart from its lazily created OpenAI
+    client, so read-only tests can share one instance per directory
+    instead of constructing their own. Tests that need non-default
+    construction (e.g. local_only=True) keep calling the constructor.
+    """
+    from app.ingestion import DocumentIngester
+
+    cache = {}
+
+    def make(docs_dir):
+        return cache.setdefault(docs_dir, DocumentIngester(docs_dir))
+
+    yield make
+    cache.clear()
+
+
+@pytest.fixture(scope="module")
+def store_embeddings():
+    """Fixed seeded embeddings shared by the vector-store tests."""
+    return np.random.default_rng(0).random((10, 384), dtype=np.float32)
+
+
+@pytest.fixture(scope="module")
+def populated_store(store_embeddings):
+    """One pre-filled FAISSVectorStore shared across a module.
+
+    Building a store and its embedding matrix per test re-allocates
+    megabytes for reads that never mutate; search and save are
+    read-only, so those tests share this instance. Tests that add
+    vectors or need an empty store keep constructing their own.
+    """
+    from app.vector_store import FAISSVectorStore
+
+    store = FAISSVectorStore(dim=384)
+    store.add(
+        store_embeddings,
+        [{"text": f"doc{i}", "filename": f"{i}.txt"} for i in range(10)],
+    )
+    return store
+
+
 @pytest.fixture
 def sample_text():
     """Sample text for testing."""
@@ -85,7 +146,7 @@ def mock_embeddings():
     """Mock embedding generator."""
     with patch("app.embeddings.get_cached_model") as mock:
         mock_model = MagicMock()
-        mock_model.encode.return_value = np.random.rand(3, 384).astype("float32")
+        mock_model.encode.return_value = np.random.default_rng(0).random((3, 384), dtype=np.float32)
         mock_model.get_sentence_embedding_dimension.return_value = 384
         mock.return_value = mock_model
         yield mock_model
@@ -1,7 +1,7 @@
 """
 Tests for the chunker module.
 """
-from app.chunker import chunk
+from app.chunker import chunk, chunk_with_spans, coverage_mask
 
 
 class TestChunker:
@@ -66,6 +66,16 @@ class TestChunker:
         assert "Important fact two" in combined
         assert "Important fact three" in combined
 
+    def test_chunk_with_spans_coverage(self):
+        """Span offsets should cover the source without concatenation."""
+        text = "Important fact one. Important fact two. Important fact three."
+        spans = chunk_with_spans(text, chunk_size=20, overlap=5)
+
+        assert [c for c, _, _ in spans] == list(chunk(text, chunk_size=20, overlap=5))
+        mask = coverage_mask(len(text), spans)
+        # Every non-separator position is covered by some chunk
+        assert all(mask[i] or text[i] == " " for i in range(len(text)))
+
     def test_chunk_handles_special_characters(self):
         """Chunker should handle special characters."""
         text = "Price is $100.50! What do you think? Yes, it's great."
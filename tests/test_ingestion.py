@@ -35,9 +35,9 @@ class TestDocumentIngester:
         assert ".gif" in IMAGE_EXTENSIONS
         assert ".webp" in IMAGE_EXTENSIONS
 
-    def test_init_with_docs_dir(self, temp_dir):
+    def test_init_with_docs_dir(self, temp_dir, ingester_factory):
         """Ingester should initialize with docs directory."""
-        ingester = DocumentIngester(temp_dir)
+        ingester = ingester_factory(temp_dir)
         assert ingester.docs_dir == temp_dir
 
     def test_init_local_only_mode(self, temp_dir):
@@ -49,58 +49,58 @@ class TestDocumentIngester:
         client = ingester._get_openai_client()
         assert client is None
 
-    def test_read_txt_file(self, sample_txt, temp_dir):
+    def test_read_txt_file(self, sample_txt, temp_dir, ingester_factory):
         """Ingester should read text files."""
-        ingester = DocumentIngester(temp_dir)
+        ingester = ingester_factory(temp_dir)
         
         content = ingester._read_file(sample_txt)
         
         assert "sample text file" in content
 
-    def test_read_nonexistent_file(self, temp_dir):
+    def test_read_nonexistent_file(self, temp_dir, ingester_factory):
         """Reading nonexistent file should raise error."""
-        ingester = DocumentIngester(temp_dir)
+        ingester = ingester_factory(temp_dir)
         
         with pytest.raises(RuntimeError):
             ingester._read_file(temp_dir / "nonexistent.txt")
 
-    def test_ingest_all_empty_dir(self, temp_dir):
+    def test_ingest_all_empty_dir(self, temp_dir, ingester_factory):
         """Ingesting empty directory should raise error."""
-        ingester = DocumentIngester(temp_dir)
+        ingester = ingester_factory(temp_dir)
         
         with pytest.raises(RuntimeError, match="No supported documents"):
             ingester.ingest_all()
 
-    def test_ingest_all_with_files(self, temp_dir):
+    def test_ingest_all_with_files(self, temp_dir, ingester_factory):
         """Ingester should process all supported files."""
         # Create test files
         (temp_dir / "doc1.txt").write_text("Document one content here.")
         (temp_dir / "doc2.txt").write_text("Document two content here.")
         (temp_dir / "ignored.xyz").write_text("Should be ignored.")
         
-        ingester = DocumentIngester(temp_dir)
+        ingester = ingester_factory(temp_dir)
         results = ingester.ingest_all()
         
         assert len(results) == 2
         assert all("filename" in r for r in results)
         assert all("content" in r for r in results)
 
-    def test_ingest_files_parallel(self, temp_dir):
+    def test_ingest_files_parallel(self, temp_dir, ingester_factory):
         """Parallel ingestion should work."""
         # Create test files
         for i in range(5):
             (temp_dir / f"doc{i}.txt").write_text(f"Content for document {i}.")
         
-        ingester = DocumentIngester(temp_dir)
+        ingester = ingester_factory(temp_dir)
         
         file_paths = list(temp_dir.glob("*.txt"))
         results = ingester.ingest_files(file_paths, parallel=True, max_workers=2)
         
         assert len(results) == 5
 
-    def test_image_dimension_check_small(self, temp_dir):
+    def test_image_dimension_check_small(self, temp_dir, ingester_factory):
         """Small images should be rejected."""
-        ingester = DocumentIngester(temp_dir)
+        ingester = ingester_factory(temp_dir)
         
         # Create a small test image file
         small_img = temp_dir / "small_icon.png"
@@ -132,24 +132,24 @@ class TestDocumentIngester:
             # This will use the mocked Image
             # Note: actual test depends on PIL being available
 
-    def test_ingest_skips_empty_files(self, temp_dir):
+    def test_ingest_skips_empty_files(self, temp_dir, ingester_factory):
         """Ingester should skip empty files."""
         (temp_dir / "empty.txt").write_text("")
         (temp_dir / "content.txt").write_text("This has content.")
         
-        ingester = DocumentIngester(temp_dir)
+        ingester = ingester_factory(temp_dir)
         results = ingester.ingest_all()
         
         # Only the file with content should be included
         assert len(results) == 1
         assert results[0]["filename"] == "content.txt"
 
-    def test_progress_callback(self, temp_dir):
+    def test_progress_callback(self, temp_dir, ingester_factory):
         """Progress callback should be called."""
         (temp_dir / "doc1.txt").write_text("Content 1")
         (temp_dir / "doc2.txt").write_text("Content 2")
         
-        ingester = DocumentIngester(temp_dir)
+        ingester = ingester_factory(temp_dir)
         
         progress_calls = []
         def callback(filename, current, total):
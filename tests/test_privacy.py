@@ -8,6 +8,7 @@ from unittest.mock import patch
 from app.privacy import PrivacyManager
 
 
+@pytest.mark.serial
 class TestPrivacyManager:
     """Tests for privacy controls."""
 
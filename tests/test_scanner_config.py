@@ -162,6 +162,7 @@ class TestExpandPath:
     def test_expand_env_var(self):
         """Should expand environment variables."""
         with patch.dict("os.environ", {"TEST_DIR": "/test/path"}):
+            _expand_path.cache_clear()  # drop expansions from other tests
             result = _expand_path("$TEST_DIR/subdir")
             assert "/test/path" in str(result)
 
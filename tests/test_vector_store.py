@@ -28,7 +28,7 @@ class TestFAISSVectorStore:
         """Store should add embeddings correctly."""
         store = FAISSVectorStore(dim=384)
         
-        embeddings = np.random.rand(3, 384).astype("float32")
+        embeddings = np.random.default_rng(0).random((3, 384), dtype=np.float32)
         metadata = [
             {"text": "doc1", "filename": "a.txt"},
             {"text": "doc2", "filename": "b.txt"},
@@ -44,7 +44,7 @@ class TestFAISSVectorStore:
         """Store should reject mismatched embeddings and metadata."""
         store = FAISSVectorStore(dim=384)
         
-        embeddings = np.random.rand(3, 384).astype("float32")
+        embeddings = np.random.default_rng(0).random((3, 384), dtype=np.float32)
         metadata = [{"text": "doc1"}]  # Only 1 metadata for 3 embeddings
         
         with pytest.raises(ValueError):
@@ -54,7 +54,7 @@ class TestFAISSVectorStore:
         """Store should reject embeddings with wrong dimension."""
         store = FAISSVectorStore(dim=384)
         
-        embeddings = np.random.rand(3, 256).astype("float32")  # Wrong dim
+        embeddings = np.random.default_rng(0).random((3, 256), dtype=np.float32)  # Wrong dim
         metadata = [{"text": f"doc{i}"} for i in range(3)]
         
         with pytest.raises(ValueError):
@@ -64,65 +64,52 @@ class TestFAISSVectorStore:
         """Search on empty store should return empty results."""
         store = FAISSVectorStore(dim=384)
         
-        query = np.random.rand(1, 384).astype("float32")
+        query = np.random.default_rng(0).random((1, 384), dtype=np.float32)
         results = store.search(query, k=5)
         
         assert results == []
 
-    def test_search_returns_results(self):
+    def test_search_returns_results(self, populated_store, store_embeddings):
         """Search should return relevant results."""
-        store = FAISSVectorStore(dim=384)
-        
-        # Add some embeddings
-        embeddings = np.random.rand(5, 384).astype("float32")
-        metadata = [{"text": f"doc{i}", "filename": f"{i}.txt"} for i in range(5)]
-        store.add(embeddings, metadata)
-        
         # Search with the first embedding (should find itself)
-        query = embeddings[0:1]
-        results = store.search(query, k=3)
+        query = store_embeddings[0:1]
+        results = populated_store.search(query, k=3)
         
         assert len(results) == 3
         assert all("text" in r for r in results)
         assert all("score" in r for r in results)
 
-    def test_search_respects_k(self):
+    def test_search_respects_k(self, populated_store):
         """Search should return at most k results."""
-        store = FAISSVectorStore(dim=384)
-        
-        embeddings = np.random.rand(10, 384).astype("float32")
-        metadata = [{"text": f"doc{i}"} for i in range(10)]
-        store.add(embeddings, metadata)
-        
-        query = np.random.rand(1, 384).astype("float32")
+        query = np.random.default_rng(0).random((1, 384), dtype=np.float32)
         
-        results_3 = store.search(query, k=3)
-        results_5 = store.search(query, k=5)
+        results_3 = populated_store.search(query, k=3)
+        results_5 = populated_store.search(query, k=5)
         
         assert len(results_3) == 3
         assert len(results_5) == 5
 
-    def test_save_and_load(self, temp_dir):
+    def test_save_and_load(self, populated_store, temp_dir):
         """Store should save and load correctly."""
-        store = FAISSVectorStore(dim=384)
-        
-        embeddings = np.random.rand(5, 384).astype("float32")
-        metadata = [{"text": f"doc{i}", "value": i} for i in range(5)]
-        store.add(embeddings, metadata)
+        store = populated_store
         
         # Save
         save_path = temp_dir / "test_index"
         store.save(save_path)
         
-        # Verify files exist
+        # Verify files exist (metadata is feather when pyarrow is
+        # installed, JSON otherwise; pickle only as a last resort)
         assert (save_path.with_suffix(".faiss")).exists()
-        assert (save_path.with_suffix(".pkl")).exists()
+        assert any(
+            save_path.with_suffix(ext).exists()
+            for ext in (".feather", ".json", ".pkl")
+        )
         
         # Load
         loaded_store = FAISSVectorStore.load(save_path)
         
-        assert loaded_store.index.ntotal == 5
-        assert len(loaded_store.metadata) == 5
+        assert loaded_store.index.ntotal == 10
+        assert len(loaded_store.metadata) == 10
         assert loaded_store.dim == 384
 
     def test_load_nonexistent(self, temp_dir):
@@ -130,16 +117,10 @@ class TestFAISSVectorStore:
         with pytest.raises(RuntimeError):
             FAISSVectorStore.load(temp_dir / "nonexistent")
 
-    def test_search_scores_ordered(self):
+    def test_search_scores_ordered(self, populated_store):
         """Search results should be ordered by score (descending)."""
-        store = FAISSVectorStore(dim=384)
-        
-        embeddings = np.random.rand(10, 384).astype("float32")
-        metadata = [{"text": f"doc{i}"} for i in range(10)]
-        store.add(embeddings, metadata)
-        
-        query = np.random.rand(1, 384).astype("float32")
-        results = store.search(query, k=10)
+        query = np.random.default_rng(0).random((1, 384), dtype=np.float32)
+        results = populated_store.search(query, k=10)
         
         scores = [r["score"] for r in results]
         assert scores == sorted(scores, reverse=True)